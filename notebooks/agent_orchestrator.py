@@ -4,82 +4,270 @@ Implements the LangGraph-based agent orchestration from Phase 3
 """
 
 import os
-import json
-from typing import Dict, Any, List, Optional, TypedDict
+import operator
+import re
+import threading
+from functools import lru_cache
+from typing import Annotated, AsyncIterator, Dict, Any, Iterator, List, Optional, Tuple, TypedDict, Union
+import httpx
+import orjson
+import tiktoken
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
-from pydantic import BaseModel, Field
-from langgraph.graph import StateGraph, END
+from pydantic import BaseModel, ConfigDict, Field
+from langgraph.errors import GraphRecursionError
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 
 from config import Config
+from semantic_cache import SemanticCache
 from specialist_tools_gui import (
     librarian_rag_tool,
     analyst_sql_tool,
     analyst_trend_tool,
     tools,
-    tool_map
+    tool_map,
+    embedding_model
 )
 
 
+# Caps in-flight LLM requests across all orchestrator runs sharing this process
+# (LangGraph runs sync nodes in worker threads, including under astream)
+_LLM_CALL_SLOTS = threading.BoundedSemaphore(Config.MAX_CONCURRENT_LLM_CALLS)
+
+# One connection pool shared by every LLM client (they all talk to the same
+# host): TLS connections stay warm and concurrent calls multiplex over HTTP/2
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=64)
+_HTTP_CLIENT = httpx.Client(http2=True, limits=_HTTP_LIMITS, timeout=60)
+_ASYNC_HTTP_CLIENT = httpx.AsyncClient(http2=True, limits=_HTTP_LIMITS, timeout=60)
+
+
+def _dumps(value: Any) -> str:
+    """Compact JSON for prompts: orjson is faster and keeps non-ASCII text unescaped."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer() -> "tiktoken.Encoding":
+    """Load the BPE tables on first use rather than at import time."""
+    return tiktoken.encoding_for_model("gpt-4o")
+
+
+# High-precision markers of a specific finance query (fiscal period, named
+# metric, amount, year); a match lets the gatekeeper skip its LLM call
+_SPECIFIC_PATTERNS = [
+    re.compile(r"\bQ[1-4]\s*20\d\d\b"),
+    re.compile(r"\b(revenue|income|EBITDA|margin|eps)\b", re.I),
+    re.compile(r"\$\s*\d"),
+    re.compile(r"\b20\d\d\b"),
+]
+
+# A plan step such as: librarian_rag_tool('AI risks')
+_TOOL_CALL_RE = re.compile(r"^\s*(\w+)\s*\((.*)\)\s*$", re.DOTALL)
+
+
+def _compress_tool_output(output: Any, max_tokens: int = Config.MAX_TOOL_OUTPUT_TOKENS,
+                          summaries_only: bool = False) -> str:
+    """
+    Serialize a tool output for a prompt while keeping it under a token budget.
+    
+    Librarian results (lists of chunks) keep their best re-ranked chunks first,
+    optionally reduced to their summaries; any other output that is still too
+    long is cut down to its head and tail. The full output stays untouched in
+    the agent state.
+    
+    Args:
+        output: The raw tool output
+        max_tokens: Token budget for the serialized output
+        summaries_only: Drop the full chunk text of librarian results
+        
+    Returns:
+        The (possibly compressed) output as prompt text
+    """
+    tokenizer = _get_tokenizer()
+    if isinstance(output, list) and all(isinstance(item, dict) for item in output):
+        items = sorted(output, key=lambda item: item.get('rerank_score', 0), reverse=True)
+        if summaries_only:
+            items = [{key: value for key, value in item.items() if key != 'content'} for item in items]
+        kept, used_tokens = [], 0
+        for item in items:
+            item_tokens = len(tokenizer.encode(_dumps(item)))
+            if kept and used_tokens + item_tokens > max_tokens:
+                break
+            kept.append(item)
+            used_tokens += item_tokens
+        text = _dumps(kept)
+    else:
+        text = output if isinstance(output, str) else _dumps(output)
+    
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    half = max_tokens // 2
+    return f"{tokenizer.decode(tokens[:half])}\n[... truncated ...]\n{tokenizer.decode(tokens[-half:])}"
+
+
 class AgentState(TypedDict):
     """Defines the state of our agent graph."""
     original_request: str
     clarification_question: Optional[str]
     plan: List[str]
-    intermediate_steps: List[Dict[str, Any]]
-    verification_history: List[Dict[str, Any]]
+    # True while the plan comes fresh from the planner LLM and is not cached yet
+    new_plan: bool
+    # Parallel tool executions each return their own step; the reducer merges them
+    intermediate_steps: Annotated[List[Dict[str, Any]], operator.add]
+    verification_history: List["BatchVerificationResult"]
+    audited_steps: int
     final_response: str
 
 
+class ToolCallState(TypedDict):
+    """Payload sent to a single tool executor branch."""
+    step: str
+
+
 class VerificationResult(BaseModel):
     """Structured output for the Auditor node."""
+    model_config = ConfigDict(frozen=True)
+    
     confidence_score: int = Field(description="Score from 1-5 on confidence in the tool's output.")
     is_consistent: bool = Field(description="Is the output internally consistent?")
     is_relevant: bool = Field(description="Is the output relevant to the original user request?")
     reasoning: str = Field(description="Brief reasoning for the scores.")
 
 
+class Plan(BaseModel):
+    """Structured output for the Planner node."""
+    steps: List[str] = Field(description="Each step is a tool call like tool_name('query') or FINISH.")
+
+
+class BatchVerificationResult(BaseModel):
+    """Structured output for auditing several tool outputs in one Auditor call."""
+    model_config = ConfigDict(frozen=True)
+    
+    results: List[VerificationResult] = Field(description="One verification result per tool output, in the order given.")
+
+
 class FinancialAgentOrchestrator:
     """
     Main orchestrator for the financial analysis agent system.
     Implements the LangGraph workflow from Phase 3.
     """
     
+    # Static system prompts are sent verbatim as the leading message so the
+    # provider's automatic prompt caching can reuse them across calls.
+    AUDIT_SYSTEM_PROMPT = """You are a meticulous fact-checker and auditor. Given the user's original request and the numbered outputs from one or more tools, please audit each output.
+
+**Audit Checklist:**
+1.  **Relevance:** Is this output directly relevant to answering the user's request? (Score 1-5, where 5 is highly relevant).
+2.  **Consistency:** Is the data internally consistent? (e.g., no contradictory statements).
+
+For each output, in the order given, provide a confidence score and a brief reasoning."""
+    
+    SYNTHESIZER_SYSTEM_PROMPT = """You are an expert financial analyst acting as a strategist. Your task is to synthesize a comprehensive answer to the user's request based on the context provided by your specialist agents, generating novel insights where possible.
+
+**Instructions:**
+1.  Carefully review the context from the tool outputs.
+2.  Construct a clear, well-written, and accurate answer to the user's original request.
+3.  **Connect the Dots (Causal Inference):** After summarizing the findings, analyze the combined information. Is there a plausible causal link or correlation between different pieces of data (e.g., a risk mentioned by the Librarian and a financial trend from the Analyst)?
+4.  **Frame as Hypothesis:** Clearly state this connection as a data-grounded hypothesis, using phrases like 'The data suggests a possible link...' or 'One potential hypothesis is...'. This is your key value-add."""
+    
     def __init__(self):
         """Initialize the orchestrator with all nodes and compile the graph."""
-        # Initialize LLMs
-        self.ambiguity_llm = ChatOpenAI(
-            base_url=Config.LLM_BASE_URL,
-            model=Config.LLM_MODEL_GATEKEEPER,
-            api_key=Config.LLM_API_KEY,
-            temperature=0.
-        )
+        # Initialize LLMs: one client per model, shared by every role using that
+        # model; per-role settings are attached on top of the shared client
+        self._chat_models: Dict[str, ChatOpenAI] = {}
+        
+        self.ambiguity_llm = self._get_chat_model(Config.LLM_MODEL_GATEKEEPER)
         
-        self.supervisor_llm = ChatOpenAI(
-            base_url=Config.LLM_BASE_URL,
-            model=Config.LLM_MODEL_SUPERVISIOR,
-            api_key=Config.LLM_API_KEY,
-            temperature=0.
+        self.supervisor_llm = self._get_chat_model(Config.LLM_MODEL_SUPERVISIOR)
+        self.planner_llm = self.supervisor_llm.with_structured_output(Plan)
+        
+        self.auditor_llm = self._get_chat_model(Config.LLM_MODEL_AUDITOR).with_structured_output(BatchVerificationResult)
+        
+        self.synthesizer_llm = self._get_chat_model(Config.LLM_MODEL_SYNTHETISER).bind(temperature=0.2)
+        
+        # Semantic cache of generated plans, keyed on the user request
+        self.plan_cache = SemanticCache(
+            embedding_model,
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            ttl=Config.SEMANTIC_CACHE_TTL,
+            max_entries=Config.SEMANTIC_CACHE_MAX_ENTRIES
         )
         
-        self.auditor_llm = ChatOpenAI(
-            base_url=Config.LLM_BASE_URL,
-            model=Config.LLM_MODEL_AUDITOR,
-            api_key=Config.LLM_API_KEY,
-            temperature=0.
-        ).with_structured_output(VerificationResult)
-        
-        self.synthesizer_llm = ChatOpenAI(
-            base_url=Config.LLM_BASE_URL,
-            model=Config.LLM_MODEL_SYNTHETISER,
-            api_key=Config.LLM_API_KEY,
-            temperature=0.2
+        # Static prompt prefixes, built once and reused on every call
+        # (tools sorted so the planner prefix is byte-identical across runs)
+        self._planner_prompt_template = self._create_planner_prompt(
+            tuple(sorted((tool.name, tool.description.strip()) for tool in tools))
         )
+        self._audit_system_message = SystemMessage(content=self.AUDIT_SYSTEM_PROMPT)
+        self._synthesizer_system_message = SystemMessage(content=self.SYNTHESIZER_SYSTEM_PROMPT)
         
         # Build the graph
         self.app = self._build_graph()
         
+        self._warm_up_connection()
+        
         print("✓ Agent orchestrator initialized successfully!")
     
+    def _get_chat_model(self, model: str) -> ChatOpenAI:
+        """Return the shared temperature-0 client for a model, creating it on first use."""
+        if model not in self._chat_models:
+            self._chat_models[model] = ChatOpenAI(
+                base_url=Config.LLM_BASE_URL,
+                model=model,
+                api_key=Config.LLM_API_KEY,
+                http_client=_HTTP_CLIENT,
+                http_async_client=_ASYNC_HTTP_CLIENT,
+                max_retries=Config.LLM_MAX_RETRIES,
+                temperature=0.
+            )
+        return self._chat_models[model]
+    
+    def _warm_up_connection(self):
+        """Open the shared connection to the LLM API so the first query skips the handshake."""
+        try:
+            _HTTP_CLIENT.get(
+                f"{Config.LLM_BASE_URL.rstrip('/')}/models",
+                headers={"Authorization": f"Bearer {Config.LLM_API_KEY}"}
+            )
+        except httpx.HTTPError as e:
+            print(f"⚠️ Could not pre-warm the LLM connection: {e}")
+    
+    def _route_entry(self, state: AgentState) -> List[str]:
+        """Starts a run, planning speculatively while the LLM gatekeeper decides."""
+        # Local fast path: obviously specific requests need no gatekeeper at all
+        if any(pattern.search(state['original_request']) for pattern in _SPECIFIC_PATTERNS):
+            print("  - Request is specific (rule-based fast path). Proceeding to planner.")
+            return ["planner"]
+        if Config.SPECULATE_PLANNER:
+            print("  - Running gatekeeper and speculative planner in parallel.")
+            return ["ambiguity_check", "planner"]
+        return ["ambiguity_check"]
+    
+    def _decide_proceed_node(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Join point of the gatekeeper and the (possibly speculative) planner.
+        
+        A plan is cached only here, once the request has cleared the gatekeeper;
+        a speculative plan for a request needing clarification is dropped.
+        """
+        if state.get("clarification_question"):
+            return {"plan": [], "new_plan": False}
+        if state.get("new_plan"):
+            self.plan_cache.put(state['original_request'], tuple(state['plan']))
+            return {"new_plan": False}
+        return {}
+    
+    def _route_after_gatekeeper(self, state: AgentState) -> Union[str, List[Send]]:
+        """Halts on a clarification question, otherwise plans or executes the plan."""
+        if state.get("clarification_question"):
+            print("  - Decision: Ambiguity detected. Discarding any plan and halting to ask user.")
+            return END
+        if not state.get("plan"):
+            return "planner"
+        return self._dispatch_tools(state)
+    
     def _ambiguity_check_node(self, state: AgentState) -> Dict[str, Any]:
         """Checks if the user's request is ambiguous and requires clarification."""
         print("\n-- Gatekeeper (Ambiguity Check) Node --")
@@ -93,18 +281,27 @@ class FinancialAgentOrchestrator:
 
         User Request: "{request}"\nResponse:"""
         
-        response = self.ambiguity_llm.invoke(prompt).content
+        with _LLM_CALL_SLOTS:
+            response = self.ambiguity_llm.invoke(prompt).content
         
         if response.strip() == "OK":
-            print("  - Request is specific. Proceeding to planner.")
+            print("  - Request is specific (LLM gatekeeper). Proceeding to planner.")
             return {"clarification_question": None}
         else:
-            print(f"  - Request is ambiguous. Generating clarification question.")
+            print(f"  - Request is ambiguous (LLM gatekeeper). Generating clarification question.")
             return {"clarification_question": response}
     
-    def _create_planner_prompt(self):
-        """Create the prompt template for the planner."""
-        tool_descriptions = "\n".join([f"- {tool.name}: {tool.description.strip()}" for tool in tools])
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _create_planner_prompt(tool_specs: Tuple[Tuple[str, str], ...]) -> str:
+        """
+        Create the prompt template for the planner.
+        
+        Args:
+            tool_specs: Sorted (name, description) pairs of the available tools,
+                so that a change to the tool registry yields a new template
+        """
+        tool_descriptions = "\n".join([f"- {name}: {description}" for name, description in tool_specs])
         return f"""You are a master financial analyst agent, the Supervisor. Your task is to create a step-by-step plan to answer the user's request by intelligently selecting from the available tools.
 
 **Available Tools:**
@@ -115,94 +312,95 @@ class FinancialAgentOrchestrator:
 2. Create a clear, step-by-step plan. Each step must be a call to one of the available tools.
 3. The final step in your plan should ALWAYS be 'FINISH'.
 
-**Output Format:**
-Return ONLY a valid JSON array of strings. Each string should be a tool call.
-For tool calls, use this exact format: tool_name('query text here')
-Do NOT include any explanation, markdown formatting, or extra text.
+**Step Format:**
+Each step is a single tool call in this exact format: tool_name('query text here')
 
-Example output:
+Example steps:
 ["analyst_trend_tool('analyze revenue')", "FINISH"]
 
 Another example:
 ["librarian_rag_tool('AI risks')", "analyst_sql_tool('Q4 2023 revenue')", "FINISH"]
 
 ---
-User Request: {{request}}
-
-Plan (JSON array only):"""
+User Request: {{request}}"""
     
     def _planner_node(self, state: AgentState) -> Dict[str, Any]:
         """Creates a step-by-step plan to answer the user's request."""
         print("\n-- Planner Node --")
         request = state['original_request']
-        planner_prompt_template = self._create_planner_prompt()
-        prompt = planner_prompt_template.format(request=request)
-        plan_str = self.supervisor_llm.invoke(prompt).content
         
-        print(f"  - Raw plan response: {plan_str}")
+        # Replanning after a failed audit must not reuse the plan that failed
+        is_first_plan = not state.get('intermediate_steps')
+        if is_first_plan:
+            cached_plan = self.plan_cache.get(request)
+            if cached_plan is not None:
+                print(f"  - Semantic cache hit. Reusing plan: {list(cached_plan)}")
+                return {"plan": list(cached_plan), "new_plan": False}
+        
+        prompt = self._planner_prompt_template.format(request=request)
         
         try:
-            # Try to parse as JSON first (more robust)
-            import json
-            import ast
-            
-            # Clean up the response - remove markdown code blocks if present
-            cleaned_plan = plan_str.strip()
-            if cleaned_plan.startswith('```'):
-                # Remove markdown code block markers
-                lines = cleaned_plan.split('\n')
-                cleaned_plan = '\n'.join([line for line in lines if not line.strip().startswith('```')])
-                cleaned_plan = cleaned_plan.strip()
-            
-            # Try JSON parsing first
-            try:
-                plan = json.loads(cleaned_plan)
-            except json.JSONDecodeError:
-                # Fall back to ast.literal_eval (safer than eval)
-                plan = ast.literal_eval(cleaned_plan)
+            # Structured output: the plan comes back already parsed and validated
+            with _LLM_CALL_SLOTS:
+                plan = self.planner_llm.invoke(prompt).steps
             
             # Validate that plan is a list
             if not isinstance(plan, list):
                 raise ValueError(f"Plan must be a list, got {type(plan)}")
             
             print(f"  - Generated Plan: {plan}")
-            return {"plan": plan}
+            return {"plan": plan, "new_plan": True}
         except Exception as e:
-            print(f"Error parsing plan: {e}. Falling back to FINISH.")
-            print(f"  - Failed plan string: {plan_str}")
-            return {"plan": ["FINISH"]}
+            print(f"Error generating plan: {e}. Falling back to FINISH.")
+            return {"plan": ["FINISH"], "new_plan": False}
     
-    def _tool_executor_node(self, state: AgentState) -> Dict[str, Any]:
-        """Executes the next step in the plan."""
+    @staticmethod
+    def _next_tool_batch(plan: List[str]) -> List[str]:
+        """
+        Return the leading steps of the plan that can be executed concurrently.
+        
+        Planned tool calls take only literal queries, so every step before
+        'FINISH' is independent of the others.
+        """
+        batch = []
+        for step in plan:
+            if step == "FINISH":
+                break
+            batch.append(step)
+        return batch
+    
+    def _dispatch_tools(self, state: AgentState) -> Union[str, List[Send]]:
+        """Fans out the next batch of independent tool calls, one executor branch per step."""
+        batch = self._next_tool_batch(state.get('plan', []))
+        if not batch:
+            print("  - Decision: No tool to execute. Routing to synthesizer.")
+            return "synthesize"
+        print(f"  - Dispatching {len(batch)} tool call(s) in parallel.")
+        return [Send("execute_tool", {"step": step}) for step in batch]
+    
+    def _tool_executor_node(self, state: ToolCallState) -> Dict[str, Any]:
+        """Executes a single tool call dispatched from the plan."""
         print("\n-- Tool Executor Node --")
-        next_step = state['plan'][0]
+        next_step = state['step']
         
-        try:
-            # Parse the tool call
-            if '(' not in next_step or ')' not in next_step:
-                raise ValueError(f"Invalid tool call format: {next_step}")
-            
-            tool_name = next_step.split('(')[0].strip()
-            tool_input_str = next_step[len(tool_name)+1:-1].strip()
-            
-            # Handle quoted strings properly
-            import ast
-            try:
-                tool_input = ast.literal_eval(tool_input_str)
-            except (ValueError, SyntaxError):
-                # If literal_eval fails, treat it as a plain string
-                tool_input = tool_input_str.strip('\'"')
-            
-        except Exception as e:
-            print(f"  - Error parsing tool call '{next_step}': {e}. Skipping step.")
-            return {"plan": state['plan'][1:], "intermediate_steps": state.get('intermediate_steps', [])}
-
-        print(f"  - Executing tool: {tool_name} with input: '{tool_input}'")
+        # Parse the tool call
+        match = _TOOL_CALL_RE.match(next_step)
+        if match is None:
+            print(f"  - Error parsing tool call '{next_step}': invalid tool call format. Skipping step.")
+            return {"intermediate_steps": []}
         
-        # Verify tool exists
+        # Verify tool exists before bothering with its argument
+        tool_name = match.group(1)
         if tool_name not in tool_map:
             print(f"  - Error: Tool '{tool_name}' not found in tool_map. Available tools: {list(tool_map.keys())}")
-            return {"plan": state['plan'][1:], "intermediate_steps": state.get('intermediate_steps', [])}
+            return {"intermediate_steps": []}
+        
+        # Strip matching outer quotes from the argument
+        raw_input = match.group(2).strip()
+        is_quoted = len(raw_input) >= 2 and raw_input[0] in "'\"" and raw_input[-1] == raw_input[0]
+        tool_input = raw_input[1:-1] if is_quoted else raw_input
+
+        print(f"  - Executing tool: {tool_name} with input: '{tool_input}'")
         
         tool_to_call = tool_map[tool_name]
         result = tool_to_call.invoke(tool_input)
@@ -213,38 +411,63 @@ Plan (JSON array only):"""
             'tool_output': result
         }
         
-        current_steps = state.get('intermediate_steps', [])
-        return {
-            "intermediate_steps": current_steps + [new_intermediate_step],
-            "plan": state['plan'][1:]
-        }
+        # Only the new step is returned; the state reducer appends it
+        return {"intermediate_steps": [new_intermediate_step]}
+    
+    def _advance_plan_node(self, state: AgentState) -> Dict[str, Any]:
+        """Removes the executed batch from the plan once all its parallel branches have joined."""
+        executed_count = len(self._next_tool_batch(state['plan']))
+        return {"plan": state['plan'][executed_count:]}
+    
+    @staticmethod
+    def _unaudited_steps(state: AgentState) -> List[Dict[str, Any]]:
+        """Return the tool outputs that no auditor pass has checked yet."""
+        return state.get('intermediate_steps', [])[state.get('audited_steps', 0):]
     
     def _verification_node(self, state: AgentState) -> Dict[str, Any]:
-        """Audits the most recent tool output for quality and relevance."""
+        """Audits every not-yet-verified tool output in a single auditor call."""
         print("\n-- Auditor (Self-Correction) Node --")
         request = state['original_request']
-        last_step = state['intermediate_steps'][-1]
+        new_steps = self._unaudited_steps(state)
         
-        prompt = f"""You are a meticulous fact-checker and auditor. Given the user's original request and the output from a tool, please audit the output.
-        
-        **User Request:** {request}
-        **Tool:** {last_step['tool_name']}
-        **Tool Output:** {json.dumps(last_step['tool_output'])}
-        
-        **Audit Checklist:**
-        1.  **Relevance:** Is this output directly relevant to answering the user's request? (Score 1-5, where 5 is highly relevant).
-        2.  **Consistency:** Is the data internally consistent? (e.g., no contradictory statements).
+        outputs_block = "\n\n".join(
+            f"""### Output {i}
+**Tool:** {step['tool_name']}
+**Tool Input:** {step['tool_input']}
+**Tool Output:** {_compress_tool_output(step['tool_output'])}"""
+            for i, step in enumerate(new_steps, 1)
+        )
+        prompt = [
+            self._audit_system_message,
+            HumanMessage(content=f"**User Request:** {request}\n\n{outputs_block}")
+        ]
         
-        Based on this, provide a confidence score and a brief reasoning.
-        """
+        with _LLM_CALL_SLOTS:
+            audit_result = self.auditor_llm.invoke(prompt)
         
-        audit_result = self.auditor_llm.invoke(prompt)
-        print(f"  - Audit Confidence Score: {audit_result.confidence_score}/5")
+        # One result per output: an output the auditor skipped counts as failed, not passed
+        if len(audit_result.results) != len(new_steps):
+            print(f"  - Auditor returned {len(audit_result.results)} result(s) for {len(new_steps)} output(s); "
+                  f"treating unchecked outputs as failed.")
+            missing = VerificationResult(
+                confidence_score=0, is_consistent=False, is_relevant=False,
+                reasoning="No audit result was returned for this output."
+            )
+            results = list(audit_result.results[:len(new_steps)])
+            audit_result = BatchVerificationResult(
+                results=results + [missing] * (len(new_steps) - len(results))
+            )
+        for step, result in zip(new_steps, audit_result.results):
+            print(f"  - Audit Confidence Score ({step['tool_name']}): {result.confidence_score}/5")
         
+        # The validated model is stored as-is; no dict conversion on the hot path
         current_history = state.get('verification_history', [])
-        return {"verification_history": current_history + [audit_result.model_dump()]}
+        return {
+            "verification_history": current_history + [audit_result],
+            "audited_steps": state.get('audited_steps', 0) + len(new_steps)
+        }
     
-    def _router_node(self, state: AgentState) -> str:
+    def _router_node(self, state: AgentState) -> Union[str, List[Send]]:
         """Decides the next step in the graph based on the current state."""
         print("\n-- Advanced Router Node --")
 
@@ -258,32 +481,37 @@ Plan (JSON array only):"""
             print("  - Decision: New request. Routing to planner.")
             return "planner"
 
-        # Check the last verification result if it exists
+        # Keep executing until the plan reaches FINISH
+        if state["plan"][0] != "FINISH":
+            print("  - Decision: Plan has more steps. Routing to tool executor.")
+            return self._dispatch_tools(state)
+
+        # The plan is complete: audit all new outputs in one pass
+        if self._unaudited_steps(state):
+            print("  - Decision: Plan is complete. Routing to auditor.")
+            return "verify"
+
+        # Check the per-step results of the last verification
         if state.get("verification_history"):
             last_verification = state["verification_history"][-1]
-            if last_verification["confidence_score"] < 3:
-                print("  - Decision: Verification failed. Returning to planner.")
-                # Clear the plan to force replanning
-                state['plan'] = [] 
+            failed_steps = [i for i, result in enumerate(last_verification.results, 1)
+                            if result.confidence_score < Config.VERIFICATION_THRESHOLD]
+            if failed_steps:
+                print(f"  - Decision: Verification failed for output(s) {failed_steps}. Returning to planner.")
                 return "planner"
 
-        # Check if the plan is complete
-        if not state.get("plan") or state["plan"][0] == "FINISH":
-            print("  - Decision: Plan is complete. Routing to synthesizer.")
-            return "synthesize"
-        else:
-            print("  - Decision: Plan has more steps. Routing to tool executor.")
-            return "execute_tool"
+        print("  - Decision: Outputs verified. Routing to synthesizer.")
+        return "synthesize"
     
     def _synthesizer_node(self, state: AgentState) -> Dict[str, Any]:
         """Synthesizes the final response with causal inference."""
         print("\n-- Strategist (Synthesizer) Node --")
         request = state['original_request']
-        context = "\n\n".join([f"## Tool: {step['tool_name']}\nInput: {step['tool_input']}\nOutput: {json.dumps(step['tool_output'], indent=2)}" for step in state['intermediate_steps']])
-
-        prompt = f"""You are an expert financial analyst acting as a strategist. Your task is to synthesize a comprehensive answer to the user's request based on the context provided by your specialist agents, generating novel insights where possible.
+        context = "\n\n".join([f"## Tool: {step['tool_name']}\nInput: {step['tool_input']}\nOutput: {_compress_tool_output(step['tool_output'], summaries_only=True)}" for step in state['intermediate_steps']])
 
-**User Request:**
+        prompt = [
+            self._synthesizer_system_message,
+            HumanMessage(content=f"""**User Request:**
 {request}
 
 **Context from Agents:**
@@ -291,16 +519,12 @@ Plan (JSON array only):"""
 {context}
 ---
 
-**Instructions:**
-1.  Carefully review the context from the tool outputs.
-2.  Construct a clear, well-written, and accurate answer to the user's original request.
-3.  **Connect the Dots (Causal Inference):** After summarizing the findings, analyze the combined information. Is there a plausible causal link or correlation between different pieces of data (e.g., a risk mentioned by the Librarian and a financial trend from the Analyst)?
-4.  **Frame as Hypothesis:** Clearly state this connection as a data-grounded hypothesis, using phrases like 'The data suggests a possible link...' or 'One potential hypothesis is...'. This is your key value-add.
-
-Final Answer:
-"""
+Final Answer:""")
+        ]
         
-        final_answer = self.synthesizer_llm.invoke(prompt).content
+        # Streamed so that stream_response() can forward tokens as they arrive
+        with _LLM_CALL_SLOTS:
+            final_answer = "".join(chunk.content for chunk in self.synthesizer_llm.stream(prompt))
         print("  - Generated final answer with causal inference.")
         return {"final_response": final_answer}
     
@@ -311,37 +535,41 @@ Final Answer:
         # Add nodes
         graph_builder.add_node("ambiguity_check", self._ambiguity_check_node)
         graph_builder.add_node("planner", self._planner_node)
+        graph_builder.add_node("decide_proceed", self._decide_proceed_node)
         graph_builder.add_node("execute_tool", self._tool_executor_node)
+        graph_builder.add_node("advance_plan", self._advance_plan_node)
         graph_builder.add_node("verify", self._verification_node)
         graph_builder.add_node("synthesize", self._synthesizer_node)
 
-        # Define the entry point
-        graph_builder.set_entry_point("ambiguity_check")
-
-        # Define the conditional edge from the ambiguity checker
+        # Define the entry point: gatekeeper, planner, or both in parallel
         graph_builder.add_conditional_edges(
-            "ambiguity_check",
-            lambda state: "planner" if state.get("clarification_question") is None else END,
-            {"planner": "planner", END: END}
+            START,
+            self._route_entry,
+            ["ambiguity_check", "planner"]
         )
 
-        # After planning, always execute a tool
-        graph_builder.add_edge("planner", "execute_tool")
-
-        # After execution, always verify
-        graph_builder.add_edge("execute_tool", "verify")
+        # Gatekeeper and planner join here (once per superstep, whichever ran)
+        graph_builder.add_edge("ambiguity_check", "decide_proceed")
+        graph_builder.add_edge("planner", "decide_proceed")
 
-        # The ADVANCED ROUTER connects the verification step to the next logical node
+        # Stop for clarification, or fan out the first batch of independent tool calls
         graph_builder.add_conditional_edges(
-            "verify",
-            self._router_node,
-            {
-                "planner": "planner",
-                "execute_tool": "execute_tool",
-                "synthesize": "synthesize",
-            }
+            "decide_proceed",
+            self._route_after_gatekeeper,
+            ["planner", "execute_tool", "synthesize", END]
         )
 
+        # Parallel executions join here before the plan moves on
+        graph_builder.add_edge("execute_tool", "advance_plan")
+
+        # The ADVANCED ROUTER loops over the plan, then verifies all outputs at once
+        for source in ("advance_plan", "verify"):
+            graph_builder.add_conditional_edges(
+                source,
+                self._router_node,
+                ["planner", "execute_tool", "verify", "synthesize", END]
+            )
+
         # The synthesizer is a terminal node
         graph_builder.add_edge("synthesize", END)
 
@@ -351,50 +579,141 @@ Final Answer:
         print("✓ Graph compiled successfully!")
         return app
     
-    def run(self, query: str, show_intermediate: bool = True, max_iterations: int = 5) -> Dict[str, Any]:
+    @staticmethod
+    def _initial_state(query: str) -> Dict[str, Any]:
+        """Build the graph input for a new query."""
+        # Ensure initial state has empty lists for accumulation
+        return {
+            "original_request": query,
+            "verification_history": [],
+            "intermediate_steps": [],
+            "audited_steps": 0
+        }
+    
+    @staticmethod
+    def _stopped_state(last_state: Dict[str, Any], max_iterations: int) -> Dict[str, Any]:
+        """Flag the last state reached before the recursion limit stopped the run."""
+        print(f"⚠️ Max iterations ({max_iterations}) reached. Stopping with the partial state.")
+        return {**last_state, "max_iterations_reached": True}
+    
+    def _print_run_header(self, query: str):
+        """Print the banner shown at the start of a run."""
+        print("\n" + "="*80)
+        print("🚀 RUNNING AGENT ORCHESTRATOR")
+        print("="*80)
+        print(f"📝 Query: {query}")
+        print("="*80 + "\n")
+    
+    def _print_run_footer(self, final_state: Dict[str, Any]):
+        """Print the run outcome and plan cache statistics."""
+        print("\n" + "="*80)
+        if final_state.get('max_iterations_reached'):
+            print("⏹️ STOPPED (max iterations reached)")
+        elif final_state.get('clarification_question'):
+            print("❓ CLARIFICATION NEEDED")
+        else:
+            print("✅ COMPLETED")
+        cache_stats = self.plan_cache.stats()
+        print(f"🧠 Plan cache: {cache_stats['hits']} hit(s) / {cache_stats['misses']} miss(es) "
+              f"(hit rate {cache_stats['hit_rate']:.0%})")
+        print("="*80 + "\n")
+    
+    def run(self, query: str, show_intermediate: bool = True,
+            max_iterations: int = Config.MAX_ITERATIONS) -> Dict[str, Any]:
         """
         Run the agent orchestrator on a query.
         
         Args:
             query: The user's question
             show_intermediate: Whether to include intermediate steps in output
-            max_iterations: Maximum number of iterations (safety limit)
+            max_iterations: Maximum number of graph steps (LangGraph recursion limit)
             
         Returns:
-            Dictionary containing the result and metadata
+            Dictionary containing the result and metadata; it has
+            'max_iterations_reached': True if the run was cut short, with the
+            steps completed so far
         """
-        print("\n" + "="*80)
-        print("🚀 RUNNING AGENT ORCHESTRATOR")
-        print("="*80)
-        print(f"📝 Query: {query}")
-        print("="*80 + "\n")
+        self._print_run_header(query)
         
-        # Ensure initial state has empty lists for accumulation
-        inputs = {
-            "original_request": query,
-            "verification_history": [],
-            "intermediate_steps": []
-        }
-        final_state = {}
-        
-        # Stream and capture the last state
-        iteration = 0
-        for output in self.app.stream(inputs, stream_mode="values"):
-            final_state.update(output)
-            iteration += 1
-            if iteration > max_iterations:
-                print(f"⚠️ Max iterations ({max_iterations}) reached. Stopping.")
-                break
+        # Each yielded value is the full state after a step; keep the last one seen
+        final_state = self._initial_state(query)
+        try:
+            for final_state in self.app.stream(final_state, stream_mode="values",
+                                               config={"recursion_limit": max_iterations}):
+                pass
+        except GraphRecursionError:
+            final_state = self._stopped_state(final_state, max_iterations)
         
-        print("\n" + "="*80)
-        if final_state.get('clarification_question'):
-            print("❓ CLARIFICATION NEEDED")
-        else:
-            print("✅ COMPLETED")
-        print("="*80 + "\n")
+        self._print_run_footer(final_state)
+        return final_state
+    
+    async def arun(self, query: str, show_intermediate: bool = True,
+                   max_iterations: int = Config.MAX_ITERATIONS) -> Dict[str, Any]:
+        """
+        Asynchronous variant of run(), so that several queries (e.g. one per
+        user session) can be orchestrated concurrently on one event loop.
+        
+        Args:
+            query: The user's question
+            show_intermediate: Whether to include intermediate steps in output
+            max_iterations: Maximum number of graph steps (LangGraph recursion limit)
+            
+        Returns:
+            Dictionary containing the result and metadata; it has
+            'max_iterations_reached': True if the run was cut short, with the
+            steps completed so far
+        """
+        self._print_run_header(query)
         
+        final_state = self._initial_state(query)
+        try:
+            async for final_state in self.app.astream(final_state, stream_mode="values",
+                                                      config={"recursion_limit": max_iterations}):
+                pass
+        except GraphRecursionError:
+            final_state = self._stopped_state(final_state, max_iterations)
+        
+        self._print_run_footer(final_state)
         return final_state
     
+    async def run_streaming(self, query: str,
+                            max_iterations: int = Config.MAX_ITERATIONS) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the agent orchestrator and yield each node's state update as it completes.
+        
+        Only the keys a node changed are yielded ({node_name: delta}), so callers
+        driving a UI don't pay for a full state copy at every step.
+        
+        Args:
+            query: The user's question
+            max_iterations: Maximum number of graph steps (LangGraph recursion limit)
+        """
+        async for update in self.app.astream(self._initial_state(query),
+                                             stream_mode="updates",
+                                             config={"recursion_limit": max_iterations}):
+            yield update
+    
+    def stream_response(self, query: str) -> Iterator[str]:
+        """
+        Run the agent orchestrator and yield the final answer as it is generated.
+        
+        Args:
+            query: The user's question
+            
+        Yields:
+            Text chunks of the synthesized answer, or the clarification question
+            if the gatekeeper halts the run
+        """
+        for mode, payload in self.app.stream(self._initial_state(query), stream_mode=["messages", "updates"]):
+            if mode == "messages":
+                chunk, metadata = payload
+                if metadata.get("langgraph_node") == "synthesize" and chunk.content:
+                    yield chunk.content
+            else:
+                clarification = (payload.get("ambiguity_check") or {}).get("clarification_question")
+                if clarification:
+                    yield clarification
+    
     def test_vector_search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Test the vector search functionality directly.
@@ -6,7 +6,6 @@ Run this if you get "Storage folder is already accessed" errors.
 
 import os
 import shutil
-import glob
 
 QDRANT_PATH = "./qdrant_storage"
 
@@ -14,21 +13,18 @@ def cleanup_qdrant_locks():
     """Remove Qdrant lock files to fix access issues."""
     print(f"Cleaning up Qdrant storage at: {QDRANT_PATH}")
     
-    # Look for lock files
-    lock_patterns = [
-        os.path.join(QDRANT_PATH, "**", "*.lock"),
-        os.path.join(QDRANT_PATH, "**", ".lock"),
-        os.path.join(QDRANT_PATH, ".qdrant.lock"),
-    ]
-    
+    # Single pass over the tree: "*.lock", ".lock" and ".qdrant.lock" all end in ".lock"
     removed_count = 0
-    for pattern in lock_patterns:
-        for lock_file in glob.glob(pattern, recursive=True):
+    for root, _, files in os.walk(QDRANT_PATH):
+        for name in files:
+            if not name.endswith(".lock"):
+                continue
+            lock_file = os.path.join(root, name)
             try:
                 os.remove(lock_file)
                 print(f"  ✓ Removed: {lock_file}")
                 removed_count += 1
-            except Exception as e:
+            except OSError as e:
                 print(f"  ✗ Failed to remove {lock_file}: {e}")
     
     if removed_count == 0:
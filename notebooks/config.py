@@ -4,6 +4,7 @@ Centralized configuration management
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -17,16 +18,32 @@ class Config:
     LLM_MODEL_SUPERVISIOR = 'gpt-4.1'
     LLM_MODEL_AUDITOR = 'gpt-4o'
     LLM_MODEL_SYNTHETISER = 'gpt-4o'
+    LLM_MAX_RETRIES = 4  # retries with exponential backoff on 429/5xx/connection errors
 
     
+    # Inference device for the embedding model and the cross-encoder ('cpu' or 'cuda')
+    RAG_DEVICE = os.environ.get('RAG_DEVICE', 'cpu')
+    
     # Embedding Configuration
     EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+    EMBEDDING_BATCH_SIZE = 32
+    EMBEDDING_BATCH_WINDOW = 0.05  # seconds to gather concurrent queries into one batch
+    SPARSE_EMBEDDING_MODEL = "prithivida/Splade_PP_en_v1"  # keyword side of hybrid search
     
     # Cross-Encoder Configuration
     CROSS_ENCODER_PATH = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    CROSS_ENCODER_ONNX_FILE = "onnx/model.onnx"  # portable FP32 export (GPU, unlisted CPUs)
+    CROSS_ENCODER_ONNX_INT8_FILES = {  # dynamic int8 exports, by platform.machine()
+        "x86_64": "onnx/model_quint8_avx2.onnx",
+        "amd64": "onnx/model_quint8_avx2.onnx",
+        "arm64": "onnx/model_qint8_arm64.onnx",
+        "aarch64": "onnx/model_qint8_arm64.onnx",
+    }
+    CROSS_ENCODER_MAX_LENGTH = 256  # every rerank batch is padded/truncated to this many tokens
     
     # Database Paths (relative to notebooks directory)
     QDRANT_PATH = "./qdrant_storage"
+    QDRANT_URL = os.environ.get('QDRANT_URL')  # Qdrant server (gRPC); embedded QDRANT_PATH storage if unset
     COLLECTION_NAME = "financial_docs"
     DB_PATH = "financials.db"
     TABLE_NAME = "revenue_summary"
@@ -50,12 +67,26 @@ class Config:
     CHUNK_NEW_AFTER = 1800
     
     # Retrieval Configuration
-    INITIAL_RETRIEVAL_LIMIT = 20
-    TOP_K_RESULTS = 5
+    INITIAL_RETRIEVAL_LIMIT = int(os.environ.get('RAG_FIRST_STAGE', 20))
+    RERANK_CANDIDATES = int(os.environ.get('RAG_RERANK_STAGE', 10))  # cross-encoded subset of the retrieved chunks
+    TOP_K_RESULTS = int(os.environ.get('RAG_TOP_K', 5))
+    
+    # Semantic Cache Configuration
+    SEMANTIC_CACHE_THRESHOLD = 0.92
+    SEMANTIC_CACHE_TTL = 3600  # seconds
+    SEMANTIC_CACHE_MAX_ENTRIES = 10000
+    QUERY_CACHE_TTL = 300  # seconds, exact-match cache of rewrites/embeddings/rerank scores
+    QUERY_CACHE_MAX_ITEMS = 4096
     
     # Agent Configuration
-    MAX_ITERATIONS = 10
+    MAX_ITERATIONS = 25  # LangGraph recursion limit (graph steps, not plan steps)
     VERIFICATION_THRESHOLD = 3
+    MAX_CONCURRENT_LLM_CALLS = 8
+    MAX_TOOL_OUTPUT_TOKENS = 2000
+    SPECULATE_PLANNER = True  # plan while the gatekeeper LLM runs; set False if cost-sensitive
+    # Opt-in: search with the raw query while the optimizer LLM runs (rerank uses the optimized
+    # one). Saves an LLM round-trip but changes which chunks are retrieved.
+    SPECULATE_RETRIEVAL = False
     
     # UI Configuration
     ITEMS_PER_PAGE = 10
@@ -71,12 +102,16 @@ class Config:
         return cls.get_notebooks_dir() / filename
     
     @classmethod
+    @lru_cache(maxsize=1)
     def validate(cls):
-        """Validate configuration settings."""
+        """Validate configuration settings (memoized, the filesystem is probed once)."""
         issues = []
         
-        # Check if cross-encoder path exists
-        if not Path(cls.CROSS_ENCODER_PATH).exists():
+        # Check if cross-encoder path exists; a HuggingFace repo ID
+        # ("org/model") is resolved by the hub, not on disk
+        path = cls.CROSS_ENCODER_PATH
+        is_hub_id = "/" in path and not path.startswith(("./", "../", "/", "~"))
+        if not is_hub_id and not Path(path).exists():
             issues.append(f"Cross-encoder model not found at {cls.CROSS_ENCODER_PATH}")
         
         # Check if notebooks directory exists
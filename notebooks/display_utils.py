@@ -54,11 +54,21 @@ Available Display Categories:
     - display_generated_prompts()
     - display_red_team_test_result()
     - display_red_team_summary()
+    - enable_red_team_hover()
 
 12. Full Application Displays (Phase 4)
     - display_app_styles()
     - display_app_final_response()
 
+Each display_*_styles() injects its stylesheet once per kernel session (the
+trend, tools, gatekeeper, planner, executor and auditor styles ship together
+as one core stylesheet); call reset_styles_cache() to inject them again (e.g.
+after clearing all outputs).
+Outside a notebook kernel the display functions return immediately; use
+set_display_enabled(True) to force them on. In trusted notebooks,
+set_style_compression(True) ships the stylesheets zlib-compressed and
+set_style_adoption(True) registers them as constructed stylesheets.
+
 Usage Example:
 --------------
 ```python
@@ -76,11 +86,132 @@ All functions automatically handle:
 - Mobile-friendly displays
 """
 
+import base64
+import html
+import io
 import json
-from typing import List, Dict, Any, Optional
-from IPython.display import display, Markdown, HTML
+import re
+import zlib
+from collections import ChainMap, Counter
+from functools import lru_cache, partial, wraps
+from numbers import Number
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Tuple
+from IPython.display import display, update_display, HTML
 import pandas as pd
 
+# Pretty-printed JSON as UTF-8 bytes: large outputs are sliced before decoding,
+# so only the part that is displayed is ever materialized as a str
+try:
+    import orjson
+    _dumps_pretty = lambda obj: orjson.dumps(
+        obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+except ImportError:
+    _dumps_pretty = lambda obj: json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+# Building the HTML is wasted work when nothing can render it (scripts, CI)
+try:
+    from IPython import get_ipython
+    _HAS_DISPLAY = getattr(get_ipython(), 'kernel', None) is not None
+except Exception:
+    _HAS_DISPLAY = False
+
+
+def set_display_enabled(flag: bool):
+    """Force the display functions on or off (e.g. to exercise them in tests)."""
+    global _HAS_DISPLAY
+    _HAS_DISPLAY = flag
+
+
+def _requires_display(func):
+    """Make a display function a no-op when no notebook frontend is attached."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _HAS_DISPLAY:
+            return None
+        return func(*args, **kwargs)
+    return wrapper
+
+
+@lru_cache(maxsize=1)
+def _markdown():
+    """Import IPython's Markdown renderer on first use (only LLM answers need it)."""
+    from IPython.display import Markdown
+    return Markdown
+
+
+@lru_cache(maxsize=1)
+def _markdown_converter():
+    """python-markdown's converter if it is installed, else None (the frontend renders)."""
+    try:
+        import markdown
+    except ImportError:
+        return None
+    return partial(markdown.markdown, extensions=['fenced_code', 'tables'])
+
+
+# Text with none of these characters and no list items has no Markdown syntax
+_MD_CHARS = frozenset('#*_`[]|>!')
+_MD_LIST_RE = re.compile(r'^\s*(?:[-+]|\d+[.)])\s', re.M)
+
+
+@lru_cache(maxsize=32)
+def _markdown_html(text: str) -> Optional[str]:
+    """Render Markdown to HTML in the kernel, or None when python-markdown is missing."""
+    if _MD_CHARS.isdisjoint(text) and not _MD_LIST_RE.search(text):
+        # Plain text: skip the parser, keep the paragraphs
+        return ''.join(f"<p>{_fmt_text(paragraph.strip())}</p>"
+                       for paragraph in text.split('\n\n') if paragraph.strip())
+    convert = _markdown_converter()
+    return convert(text) if convert else None
+
+# Tool outputs larger than this are shown as a head/tail preview
+_MAX_INLINE_BYTES = 65536
+
+# Longest free-text field (request, tool input, state value) shown in a card
+_MAX_FIELD_CHARS = 2000
+
+
+def _esc(value: Any) -> str:
+    """HTML-escape a value for interpolation into element content."""
+    return html.escape(str(value), quote=False)
+
+
+def _safe(value: Any, cap: int = _MAX_FIELD_CHARS) -> str:
+    """HTML-escape a value, cut to `cap` characters, for one card field."""
+    text = str(value)
+    return _esc(text if len(text) <= cap else text[:cap] + '…')
+
+
+class _Markup(str):
+    """Already-rendered HTML that _render() inserts verbatim."""
+
+
+class _AutoEscape:
+    """format_map() view escaping every text field that is not _Markup."""
+    __slots__ = ('_fields',)
+
+    def __init__(self, fields):
+        self._fields = fields
+
+    def __getitem__(self, key):
+        value = self._fields[key]
+        if isinstance(value, (_Markup, Number)):
+            return value
+        return _esc(value)
+
+
+def _render(template: str, fields) -> str:
+    """Fill a card template, HTML-escaping its fields unless marked as _Markup."""
+    return template.format_map(_AutoEscape(fields))
+
+
+def _fmt_text(text: str) -> str:
+    """Escape free text and keep its line breaks and indentation in HTML."""
+    return html.escape(text, quote=False).replace('\n', '<br>').replace('  ', '&nbsp;&nbsp;')
+
 
 # ============================================================================
 # SHARED CSS STYLES
@@ -106,6 +237,7 @@ COMMON_HEADER_GRADIENT = """
 """
 
 
+@lru_cache(maxsize=1)
 def _get_common_styles():
     """Return common CSS styles used across multiple display functions."""
     return """
@@ -140,6 +272,17 @@ def _get_common_styles():
     word-break: break-all;
 }
 
+/* Stat tile styles (red team summary, run app stats) */
+.stat-card {
+    background: white;
+    border: 2px solid #e5e7eb;
+    border-radius: 8px;
+    padding: 15px;
+    text-align: center;
+}
+
+.stat-label { color: #6b7280; }
+
 /* Code block styles */
 .code-block {
     padding: 12px;
@@ -153,13 +296,159 @@ def _get_common_styles():
 """
 
 
+# Sections whose <style> block was already sent to the frontend this session
+_STYLES_EMITTED = set()
+
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_WHITESPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};:,])\s*')
+
+
+def _minify_css(css: str) -> str:
+    """Drop CSS comments and collapse whitespace around punctuation (~40% fewer bytes)."""
+    css = _CSS_WHITESPACE_RE.sub(' ', _CSS_COMMENT_RE.sub('', css))
+    return _CSS_PUNCT_RE.sub(r'\1', css).strip()
+
+
+@lru_cache(maxsize=None)
+def _minified_styles(build_html) -> str:
+    return _minify_css(build_html())
+
+
+# Opt-in: ship stylesheets zlib-compressed and inflate them in the browser.
+# Requires a trusted notebook (scripts enabled) and DecompressionStream.
+_COMPRESS_STYLES = False
+
+_INFLATE_STYLES_SCRIPT = (
+    "<script>(async () => {{"
+    "if (!('DecompressionStream' in window)) return;"
+    "const bytes = Uint8Array.from(atob('{payload}'), c => c.charCodeAt(0));"
+    "const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));"
+    "document.head.insertAdjacentHTML('beforeend', await new Response(stream).text());"
+    "}})();</script>"
+)
+
+
+def set_style_compression(flag: bool):
+    """Send stylesheets zlib-compressed (~75% fewer bytes) and inflate them client-side."""
+    global _COMPRESS_STYLES
+    _COMPRESS_STYLES = flag
+
+
+@lru_cache(maxsize=None)
+def _compress_styles(styles_html: str) -> str:
+    payload = base64.b64encode(zlib.compress(styles_html.encode('utf-8'), 9)).decode('ascii')
+    return _INFLATE_STYLES_SCRIPT.format(payload=payload)
+
+
+# Opt-in: hand stylesheets to document.adoptedStyleSheets as constructed
+# CSSStyleSheet objects, registered once per page under a hash of their text.
+# Also requires a trusted notebook; takes precedence over compression.
+_ADOPT_STYLES = False
+
+_STYLE_TAG_RE = re.compile(r'</?style>')
+
+_ADOPT_STYLES_SCRIPT = (
+    "<script>(() => {{"
+    "const sheets = window.__displayUtilsSheets = window.__displayUtilsSheets || {{}};"
+    "if (sheets['{key}'] || !('adoptedStyleSheets' in document)) return;"
+    "const sheet = new CSSStyleSheet(); sheet.replaceSync({css});"
+    "document.adoptedStyleSheets = [...document.adoptedStyleSheets, sheet];"
+    "sheets['{key}'] = sheet;"
+    "}})();</script>"
+)
+
+
+def set_style_adoption(flag: bool):
+    """Register stylesheets as constructed CSSStyleSheets instead of <style> elements."""
+    global _ADOPT_STYLES
+    _ADOPT_STYLES = flag
+
+
+@lru_cache(maxsize=None)
+def _adopt_styles(styles_html: str) -> str:
+    css = _STYLE_TAG_RE.sub('', styles_html)
+    return _ADOPT_STYLES_SCRIPT.format(
+        key=f"{zlib.crc32(css.encode('utf-8')):08x}",
+        css=json.dumps(css).replace('</', '<\\/'),
+    )
+
+
+def _display_styles_once(name: str, build_html) -> None:
+    """Inject a section's stylesheet unless it was already injected this session.
+    
+    The shared base styles travel with the first sheet injected, so they
+    appear in the page only once.
+    """
+    if name in _STYLES_EMITTED:
+        return
+    sheets = [] if 'common' in _STYLES_EMITTED else [_minified_styles(_get_common_styles)]
+    sheets.append(_minified_styles(build_html))
+    styles_html = ''.join(sheets)
+    if _ADOPT_STYLES:
+        styles_html = _adopt_styles(styles_html)
+    elif _COMPRESS_STYLES:
+        styles_html = _compress_styles(styles_html)
+    display(HTML(styles_html))
+    _STYLES_EMITTED.update(('common', name))
+
+
+# The trend, tools, gatekeeper, planner, executor and auditor sheets share no
+# selectors, so they are injected together as one stylesheet. Router,
+# synthesizer, red team and run app reuse class names with different rules,
+# so they keep their own sheets and are only injected where used.
+@lru_cache(maxsize=1)
+def _build_core_styles_html() -> str:
+    return ''.join((
+        _build_trend_styles_html(),
+        _build_tools_styles_html(),
+        _build_gatekeeper_styles_html(),
+        _build_planner_styles_html(),
+        _build_executor_styles_html(),
+        _build_auditor_styles_html(),
+    ))
+
+
+def _ensure_styles_loaded() -> None:
+    """Inject the merged core stylesheet once per session."""
+    _display_styles_once('core', _build_core_styles_html)
+
+
+def reset_styles_cache():
+    """Forget which stylesheets were injected and which live outputs exist (e.g. after clearing notebook outputs)."""
+    _STYLES_EMITTED.clear()
+    _LIVE_CARDS.clear()
+    _RESULT_HANDLES.clear()
+
+
 # ============================================================================
 # LIBRARIAN TOOL DISPLAYS
 # ============================================================================
 
-def display_librarian_styles():
-    """Display CSS styles for librarian tool output."""
-    display(HTML(_get_common_styles() + """
+_RESULT_CARD_TEMPLATE = """
+<div class='result-card' style='border-left-color: {color};'>
+    <h4 style='color: {color}; margin-top: 0;'>📄 Résultat #{i}</h4>
+    <p><strong>Source:</strong> <span class='source-tag'>{source}</span> 
+       <span class='score-badge' style='background: {color};'>Score: {score:.4f}</span></p>
+    <div style='margin-top: 12px; padding: 12px; background: #f8f9fa; border-left: 3px solid {color}; border-radius: 4px;'>
+        <p style='margin: 0; color: #2c3e50;'><strong style='color: {color};'>💡 Résumé:</strong></p>
+        <p style='margin: 8px 0 0 0; color: #34495e; line-height: 1.6;'>{summary}</p>
+    </div>
+</div>
+<details style='margin: 10px 0;'>
+    <summary><b>📖 Voir le contenu complet</b></summary>
+    <pre style='background: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto;'>{content}...</pre>
+</details>
+{separator}
+"""
+
+_RESULT_SEPARATOR = '<hr style="border: none; border-top: 2px dashed #e0e0e0; margin: 20px 0;">'
+
+
+@lru_cache(maxsize=1)
+def _build_librarian_styles_html() -> str:
+    return """
 <style>
 .result-card {
     border-left: 4px solid #4A90E2;
@@ -175,9 +464,16 @@ def display_librarian_styles():
 
 .source-tag:extend(.tag) {}
 </style>
-"""))
+"""
+
+
+@_requires_display
+def display_librarian_styles():
+    """Display CSS styles for librarian tool output."""
+    _display_styles_once('librarian', _build_librarian_styles_html)
 
 
+@_requires_display
 def display_librarian_header(query: str):
     """Display header for librarian tool results."""
     gradient = COMMON_HEADER_GRADIENT.format(
@@ -189,12 +485,13 @@ def display_librarian_header(query: str):
     <h2 style='margin:0; font-size: 1.5em;'>🔍 Test du Librarian Tool</h2>
     <div style='margin-top: 15px; padding: 12px; background: rgba(255,255,255,0.1); border-radius: 6px;'>
         <div style='font-size: 0.9em; opacity: 0.9;'>📌 Requête</div>
-        <div style='font-size: 1.1em; font-style: italic; margin-top: 5px;'>{query}</div>
+        <div style='font-size: 1.1em; font-style: italic; margin-top: 5px;'>{_esc(query)}</div>
     </div>
 </div>
 """))
 
 
+@_requires_display
 def display_librarian_results(results: List[Dict[str, Any]], top_k: int = 3):
     """Display librarian tool results in a formatted way.
     
@@ -203,50 +500,52 @@ def display_librarian_results(results: List[Dict[str, Any]], top_k: int = 3):
         top_k: Number of top results to display (default: 3)
     """
     if not results:
-        display(Markdown("*Aucun résultat trouvé.*"))
+        display(HTML("<p><em>Aucun résultat trouvé.</em></p>"))
         return
     
-    display(Markdown(f"### ✨ Top {top_k} résultats les plus pertinents ({len(results)} trouvés au total)"))
-    
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
+    shown = results[:top_k]
     
-    for i, result in enumerate(results[:top_k], 1):
+    # Build every card first and send them to the frontend in one display call
+    cards = [f"<h3>✨ Top {top_k} résultats les plus pertinents ({len(results)} trouvés au total)</h3>"]
+    for i, result in enumerate(shown, 1):
         color = colors[i - 1] if i <= len(colors) else colors[0]
-        source = result.get('source', 'Unknown')
-        score = result.get('rerank_score', 0)
-        summary = result.get('summary', 'No summary available')
-        content = result.get('content', '')[:800]
-        
-        display(HTML(f"""
-<div class='result-card' style='border-left-color: {color};'>
-    <h4 style='color: {color}; margin-top: 0;'>📄 Résultat #{i}</h4>
-    <p><strong>Source:</strong> <span class='source-tag'>{source}</span> 
-       <span class='score-badge' style='background: {color};'>Score: {score:.4f}</span></p>
-    <div style='margin-top: 12px; padding: 12px; background: #f8f9fa; border-left: 3px solid {color}; border-radius: 4px;'>
-        <p style='margin: 0; color: #2c3e50;'><strong style='color: {color};'>💡 Résumé:</strong></p>
-        <p style='margin: 8px 0 0 0; color: #34495e; line-height: 1.6;'>{summary}</p>
-    </div>
-</div>
-<details style='margin: 10px 0;'>
-    <summary><b>📖 Voir le contenu complet</b></summary>
-    <pre style='background: #f8f9fa; padding: 10px; border-radius: 4px; overflow-x: auto;'>{content}...</pre>
-</details>
-{'<hr style="border: none; border-top: 2px dashed #e0e0e0; margin: 20px 0;">' if i < top_k else ''}
-"""))
-
-
+        cards.append(_render(_RESULT_CARD_TEMPLATE, {
+            'i': i,
+            'color': color,
+            'source': result.get('source', 'Unknown'),
+            'score': result.get('rerank_score', 0),
+            'summary': result.get('summary', 'No summary available'),
+            'content': result.get('content', '')[:800],
+            'separator': _Markup(_RESULT_SEPARATOR if i < top_k else ''),
+        }))
+    display(HTML("".join(cards)))
+
+
+@_requires_display
 def display_librarian_footer():
     """Display footer for librarian tool results."""
-    display(Markdown("---\n### ✅ Test complété avec succès!"))
+    display(HTML("<hr><h3>✅ Test complété avec succès!</h3>"))
 
 
 # ============================================================================
 # ANALYST TOOL DISPLAYS
 # ============================================================================
 
-def display_analyst_styles():
-    """Display CSS styles for analyst tool output."""
-    display(HTML(_get_common_styles() + """
+_ANALYST_RESULT_TEMPLATE = """
+<div class='analyst-result-card'>
+    <h3 style='margin: 0 0 10px 0;'>🧑‍💼 Test du Analyst Tool</h3>
+    <b>Requête :</b> <span style='color:#2b6cb0;font-weight:bold'>{query}</span>
+</div>
+<p style='margin: 15px 0 8px 0; color: #2c3e50; font-weight: bold; font-size: 1.05em;'>✅ Résultat final :</p>
+<pre class='analyst-output code-block'>{result}</pre>
+<hr style='margin: 20px 0; border: none; border-top: 1px solid #e0e0e0;'>
+"""
+
+
+@lru_cache(maxsize=1)
+def _build_analyst_styles_html() -> str:
+    return """
 <style>
 .analyst-result-card {
     background: linear-gradient(90deg, #f8fafc 0%, #e3e8ee 100%);
@@ -270,7 +569,13 @@ def display_analyst_styles():
 }
 .analyst-sql:extend(.code-block) {}
 </style>
-"""))
+"""
+
+
+@_requires_display
+def display_analyst_styles():
+    """Display CSS styles for analyst tool output."""
+    _display_styles_once('analyst', _build_analyst_styles_html)
 
 
 def _extract_sql_query(sql_steps: Any) -> Optional[str]:
@@ -299,6 +604,7 @@ def _extract_sql_query(sql_steps: Any) -> Optional[str]:
     return None
 
 
+@_requires_display
 def display_analyst_results(query: str, sql_steps: Any, result: str):
     """Display analyst SQL tool results.
     
@@ -307,19 +613,7 @@ def display_analyst_results(query: str, sql_steps: Any, result: str):
         sql_steps: SQL steps from intermediate execution (can be list, tuple, or string)
         result: Final result string
     """
-    display(HTML(f"""
-<div class='analyst-result-card'>
-    <h3 style='margin: 0 0 10px 0;'>🧑‍💼 Test du Analyst Tool</h3>
-    <b>Requête :</b> <span style='color:#2b6cb0;font-weight:bold'>{query}</span>
-</div>
-"""))
-    
-    # Display final result
-    display(HTML(f"""
-<p style='margin: 15px 0 8px 0; color: #2c3e50; font-weight: bold; font-size: 1.05em;'>✅ Résultat final :</p>
-<pre class='analyst-output code-block'>{result}</pre>
-<hr style='margin: 20px 0; border: none; border-top: 1px solid #e0e0e0;'>
-"""))
+    display(HTML(_render(_ANALYST_RESULT_TEMPLATE, {'query': query, 'result': result})))
 
 
 
@@ -327,9 +621,9 @@ def display_analyst_results(query: str, sql_steps: Any, result: str):
 # TREND ANALYSIS DISPLAYS
 # ============================================================================
 
-def display_trend_styles():
-    """Display CSS styles for trend analysis output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_trend_styles_html() -> str:
+    return """
 <style>
 .trend-result-card {
     background: linear-gradient(90deg, #fef3e8 0%, #fff9f0 100%);
@@ -357,9 +651,27 @@ def display_trend_styles():
     border-left: 3px solid #f59e0b;
 }
 </style>
-"""))
+"""
+
+
+@_requires_display
+def display_trend_styles():
+    """Display CSS styles for trend analysis output (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+_TREND_TEMPLATE = """
+<div class='trend-result-card'>
+    <h3 style='margin: 0 0 10px 0;'>📈 Test du Advanced Analyst Tool</h3>
+    <b>Requête :</b> <span style='color:#f59e0b;font-weight:bold'>{query}</span>
+</div>
+<p style='margin: 15px 0 8px 0; color: #2c3e50; font-weight: bold; font-size: 1.05em;'>📊 Analyse des tendances :</p>
+<div class='trend-output'>{formatted_result}</div>
+<hr style='margin: 20px 0; border: none; border-top: 1px solid #e0e0e0;'>
+"""
 
 
+@_requires_display
 def display_trend_results(query: str, result: str):
     """Display trend analysis results.
     
@@ -367,17 +679,9 @@ def display_trend_results(query: str, result: str):
         query: The original query
         result: Analysis result string
     """
-    formatted_result = result.replace('\n', '<br>').replace('  ', '&nbsp;&nbsp;')
+    formatted_result = _Markup(_fmt_text(result))
     
-    display(HTML(f"""
-<div class='trend-result-card'>
-    <h3 style='margin: 0 0 10px 0;'>📈 Test du Advanced Analyst Tool</h3>
-    <b>Requête :</b> <span style='color:#f59e0b;font-weight:bold'>{query}</span>
-</div>
-<p style='margin: 15px 0 8px 0; color: #2c3e50; font-weight: bold; font-size: 1.05em;'>📊 Analyse des tendances :</p>
-<div class='trend-output'>{formatted_result}</div>
-<hr style='margin: 20px 0; border: none; border-top: 1px solid #e0e0e0;'>
-"""))
+    display(HTML(_render(_TREND_TEMPLATE, {'query': query, 'formatted_result': formatted_result})))
 
 
 
@@ -385,9 +689,9 @@ def display_trend_results(query: str, result: str):
 # TOOLS OVERVIEW DISPLAYS
 # ============================================================================
 
-def display_tools_styles():
-    """Display CSS styles for tools overview."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_tools_styles_html() -> str:
+    return """
 <style>
 .tools-container {
     background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -460,48 +764,71 @@ def display_tools_styles():
     font-weight: bold;
 }
 </style>
-"""))
+"""
 
 
-def display_available_tools(tools: List[Any], tool_map: Optional[Dict[str, Any]] = None):
-    """Display available tools in a formatted card layout.
-    
-    Args:
-        tools: List of tool objects with 'name' and 'description' attributes
-        tool_map: Optional dictionary mapping tool names to tool objects (unused but kept for compatibility)
-    """
-    display_tools_styles()
-    
-    # Tool icons mapping
-    TOOL_ICONS = {
-        'librarian_rag_tool': '📚',
-        'analyst_sql_tool': '🗃️',
-        'analyst_trend_tool': '📈',
-    }
-    
-    # Build tools HTML
-    tools_html = ''.join([
-        f"""
+@_requires_display
+def display_tools_styles():
+    """Display CSS styles for tools overview (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+_TOOL_ATTRS = attrgetter('name', 'description')
+
+_TOOL_ICONS: Dict[str, str] = {
+    'librarian_rag_tool': '📚',
+    'analyst_sql_tool': '🗃️',
+    'analyst_trend_tool': '📈',
+}
+
+# Tool card fragments, joined around the (escaped) icon, name and description
+_TOOL_CARD_OPEN = """
     <div class='tool-card'>
         <div class='tool-header'>
-            <div class='tool-icon'>{TOOL_ICONS.get(tool.name, '🔧')}</div>
-            <h3 class='tool-name'>{tool.name}</h3>
+            <div class='tool-icon'>"""
+_TOOL_CARD_MID_NAME = """</div>
+            <h3 class='tool-name'>"""
+_TOOL_CARD_MID_DESC = """</h3>
         </div>
-        <p class='tool-description'>{tool.description.strip()}</p>
+        <p class='tool-description'>"""
+_TOOL_CARD_CLOSE = """</p>
     </div>"""
-        for tool in tools
-    ])
+
+
+@lru_cache(maxsize=8)
+def _build_tools_html(items: tuple) -> str:
+    """Build the tools overview HTML from (name, description) pairs."""
+    icon_get = _TOOL_ICONS.get
+    parts: List[str] = []
+    for name, description in items:
+        parts.extend((_TOOL_CARD_OPEN, icon_get(name, '🔧'), _TOOL_CARD_MID_NAME, _esc(name),
+                      _TOOL_CARD_MID_DESC, _esc(description), _TOOL_CARD_CLOSE))
+    tools_html = ''.join(parts)
     
-    display(HTML(f"""
+    return f"""
 <div class='tools-container'>
     <h2 class='tools-title'>🛠️ Outils Disponibles</h2>
-    <div class='tool-count'>📊 {len(tools)} outil(s) chargé(s)</div>
+    <div class='tool-count'>📊 {len(items)} outil(s) chargé(s)</div>
     {tools_html}
 </div>
 <div style='background: #d4edda; border-left: 5px solid #28a745; padding: 15px; margin: 20px 0; border-radius: 5px;'>
     <strong style='color: #155724;'>✅ Tous les outils ont été chargés avec succès!</strong>
 </div>
-"""))
+"""
+
+
+@_requires_display
+def display_available_tools(tools: List[Any], tool_map: Optional[Dict[str, Any]] = None):
+    """Display available tools in a formatted card layout.
+    
+    Args:
+        tools: List of tool objects with 'name' and 'description' attributes
+        tool_map: Optional dictionary mapping tool names to tool objects (unused but kept for compatibility)
+    """
+    _ensure_styles_loaded()
+    
+    tools_key = tuple((name, description.strip()) for name, description in map(_TOOL_ATTRS, tools))
+    display(HTML(_build_tools_html(tools_key)))
 
 
 
@@ -509,9 +836,9 @@ def display_available_tools(tools: List[Any], tool_map: Optional[Dict[str, Any]]
 # GATEKEEPER DISPLAYS
 # ============================================================================
 
-def display_gatekeeper_styles():
-    """Display CSS styles for gatekeeper test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_gatekeeper_styles_html() -> str:
+    return """
 <style>
 .gatekeeper-container { margin: 20px 0; }
 
@@ -614,24 +941,16 @@ def display_gatekeeper_styles():
     margin-right: 8px;
 }
 </style>
-"""))
+"""
 
 
-def display_gatekeeper_test(ambiguous_query: str, ambiguous_result: Dict[str, Any], 
-                            specific_query: str, specific_result: Dict[str, Any]):
-    """Display gatekeeper test results in a formatted way.
-    
-    Args:
-        ambiguous_query: The ambiguous test query
-        ambiguous_result: Result from ambiguous query test (dict with 'clarification_question' key)
-        specific_query: The specific test query
-        specific_result: Result from specific query test
-    """
-    display_gatekeeper_styles()
-    
-    clarification = ambiguous_result.get('clarification_question', 'Aucune')
-    
-    display(HTML(f"""
+@_requires_display
+def display_gatekeeper_styles():
+    """Display CSS styles for gatekeeper test output (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+_GATEKEEPER_TEMPLATE = """
 <div class='gatekeeper-container'>
     <div class='gatekeeper-header'>
         <h2 class='gatekeeper-title'>🚪 Test du Gatekeeper Node</h2>
@@ -679,18 +998,48 @@ def display_gatekeeper_test(ambiguous_query: str, ambiguous_result: Dict[str, An
         </div>
     </div>
 </div>
-"""))
-    
-    display(Markdown("""
----
-### 📊 Résumé des Tests
+"""
 
-Le **Gatekeeper** a correctement :
-- 🔴 **Identifié** la requête ambiguë et généré une question de clarification appropriée
-- 🟢 **Validé** la requête spécifique et autorisé la poursuite du processus
 
-Ce mécanisme de filtrage garantit que l'agent ne travaille que sur des requêtes bien définies et à haute valeur ajoutée.
-"""))
+_GATEKEEPER_SUMMARY_HTML = """
+<hr>
+<h3>📊 Résumé des Tests</h3>
+<p>Le <strong>Gatekeeper</strong> a correctement :</p>
+<ul>
+    <li>🔴 <strong>Identifié</strong> la requête ambiguë et généré une question de clarification appropriée</li>
+    <li>🟢 <strong>Validé</strong> la requête spécifique et autorisé la poursuite du processus</li>
+</ul>
+<p>Ce mécanisme de filtrage garantit que l'agent ne travaille que sur des requêtes bien définies et à haute valeur ajoutée.</p>
+"""
+
+
+@lru_cache(maxsize=32)
+def _build_gatekeeper_html(ambiguous_query: str, clarification: str, specific_query: str) -> str:
+    """Render the full gatekeeper card; notebook reruns replay identical inputs."""
+    return _render(_GATEKEEPER_TEMPLATE, {
+        'ambiguous_query': ambiguous_query,
+        'clarification': clarification,
+        'specific_query': specific_query,
+    }) + _GATEKEEPER_SUMMARY_HTML
+
+
+@_requires_display
+def display_gatekeeper_test(ambiguous_query: str, ambiguous_result: Dict[str, Any], 
+                            specific_query: str, specific_result: Dict[str, Any]):
+    """Display gatekeeper test results in a formatted way.
+    
+    Args:
+        ambiguous_query: The ambiguous test query
+        ambiguous_result: Result from ambiguous query test (dict with 'clarification_question' key)
+        specific_query: The specific test query
+        specific_result: Result from specific query test
+    """
+    _ensure_styles_loaded()
+    
+    # Only the clarification question is read from the result dicts, so the
+    # rendered card can be cached on three plain strings
+    clarification = (ambiguous_result or {}).get('clarification_question') or 'Aucune'
+    display(HTML(_build_gatekeeper_html(str(ambiguous_query), str(clarification), str(specific_query))))
 
 
 
@@ -698,9 +1047,9 @@ Ce mécanisme de filtrage garantit que l'agent ne travaille que sur des requête
 # PLANNER DISPLAYS
 # ============================================================================
 
-def display_planner_styles():
-    """Display CSS styles for planner test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_planner_styles_html() -> str:
+    return """
 <style>
 .planner-container { margin: 20px 0; }
 
@@ -826,30 +1175,24 @@ def display_planner_styles():
 
 .plan-summary strong { color: #0d4521; }
 </style>
-"""))
+"""
 
 
-def display_planner_test(request: str, plan: List[str]):
-    """Display planner test results in a formatted way.
-    
-    Args:
-        request: The original user request
-        plan: List of planned steps
-    """
-    display_planner_styles()
-    
-    # Build step HTML
-    steps_html = ''.join([
-        f"""<div class='plan-step {'step-finish' if 'FINISH' in step.upper() else ''}'>
-                <span class='step-number'>{i}</span>
+@_requires_display
+def display_planner_styles():
+    """Display CSS styles for planner test output (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+# Case-insensitive without allocating an upper-cased copy of every step
+_FINISH_RE = re.compile('FINISH', re.I)
+
+_PLAN_STEP_TEMPLATE = """<div class='plan-step {cls}'>
+                <span class='step-number'>{n}</span>
                 <span class='step-content'>{step}</span>
             </div>"""
-        for i, step in enumerate(plan, 1)
-    ])
-    
-    tool_count = len([s for s in plan if "FINISH" not in s.upper()])
-    
-    display(HTML(f"""
+
+_PLANNER_TEMPLATE = """
 <div class='planner-container'>
     <div class='planner-header'>
         <h2 class='planner-title'>🧠 Test du Planner Node</h2>
@@ -885,19 +1228,46 @@ def display_planner_test(request: str, plan: List[str]):
         </div>
     </div>
 </div>
-"""))
-    
-    display(Markdown(f"""
----
-### 🔍 Analyse du Plan
+"""
 
-Le **Planner** a démontré sa capacité à :
-- 🎯 **Décomposer** une requête complexe en étapes logiques et séquentielles
-- 🛠️ **Sélectionner** les outils appropriés parmi ceux disponibles ({tool_count} outil(s))
-- 📋 **Structurer** un plan d'action clair avec une étape finale de terminaison
 
-Cette planification intelligente permet à l'agent d'orchestrer efficacement ses ressources pour répondre aux besoins de l'utilisateur.
-"""))
+_PLANNER_SUMMARY_TEMPLATE = """
+<hr>
+<h3>🔍 Analyse du Plan</h3>
+<p>Le <strong>Planner</strong> a démontré sa capacité à :</p>
+<ul>
+    <li>🎯 <strong>Décomposer</strong> une requête complexe en étapes logiques et séquentielles</li>
+    <li>🛠️ <strong>Sélectionner</strong> les outils appropriés parmi ceux disponibles ({tool_count} outil(s))</li>
+    <li>📋 <strong>Structurer</strong> un plan d'action clair avec une étape finale de terminaison</li>
+</ul>
+<p>Cette planification intelligente permet à l'agent d'orchestrer efficacement ses ressources pour répondre aux besoins de l'utilisateur.</p>
+"""
+
+
+@_requires_display
+def display_planner_test(request: str, plan: List[str]):
+    """Display planner test results in a formatted way.
+    
+    Args:
+        request: The original user request
+        plan: List of planned steps
+    """
+    _ensure_styles_loaded()
+    
+    # Build step HTML and count tool steps in the same pass
+    parts: List[str] = []
+    tool_count = 0
+    for i, step in enumerate(plan, 1):
+        is_finish = _FINISH_RE.search(step) is not None
+        tool_count += not is_finish
+        parts.append(_render(_PLAN_STEP_TEMPLATE, {'cls': 'step-finish' if is_finish else '', 'n': i, 'step': step}))
+    steps_html = ''.join(parts)
+    
+    display(HTML(_render(_PLANNER_TEMPLATE, {
+        'request': request,
+        'steps_html': _Markup(steps_html),
+        'tool_count': tool_count,
+    }) + _render(_PLANNER_SUMMARY_TEMPLATE, {'tool_count': tool_count})))
 
 
 
@@ -905,9 +1275,9 @@ Cette planification intelligente permet à l'agent d'orchestrer efficacement ses
 # EXECUTOR DISPLAYS
 # ============================================================================
 
-def display_executor_styles():
-    """Display CSS styles for executor test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_executor_styles_html() -> str:
+    return """
 <style>
 .executor-container { margin: 20px 0; }
 
@@ -1047,25 +1417,17 @@ def display_executor_styles():
     font-weight: bold;
 }
 </style>
-"""))
+"""
 
 
-def display_executor_test(plan: List[str], remaining_plan: List[str], intermediate_steps: List[Dict[str, Any]]):
-    """Display executor test results in a formatted way.
-    
-    Args:
-        plan: Original plan before execution
-        remaining_plan: Plan after executing one step
-        intermediate_steps: Steps executed with their outputs (each dict has tool_name, tool_input, tool_output)
-    """
-    display_executor_styles()
-    
-    # Build initial plan items HTML
-    plan_items_html = ''.join([f"<span class='plan-item'>Étape {i}: {step}</span>" for i, step in enumerate(plan, 1)])
-    
-    # Build executed steps HTML
-    executed_steps_html = ''.join([
-        f"""
+@_requires_display
+def display_executor_styles():
+    """Display CSS styles for executor test output (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+# Executor step card; fields missing from a step fall back to _STEP_DEFAULTS
+_STEP_TEMPLATE = """
         <div class='step-output'>
             <div class='step-header'>
                 <span>🔧</span>
@@ -1073,27 +1435,92 @@ def display_executor_test(plan: List[str], remaining_plan: List[str], intermedia
             </div>
             <div class='step-detail'>
                 <div class='step-label'>🛠️ Outil utilisé :</div>
-                <div class='step-value'>{step.get('tool_name', 'Unknown')}</div>
+                <div class='step-value'>{tool_name}</div>
             </div>
             <div class='step-detail'>
                 <div class='step-label'>📝 Entrée :</div>
-                <div class='step-value'>{step.get('tool_input', 'N/A')}</div>
+                <div class='step-value'>{tool_input}</div>
             </div>
             <div class='step-detail'>
                 <div class='step-label'>📊 Sortie de l'outil :</div>
-                <div class='step-output-data'>{json.dumps(step.get('tool_output', {}), indent=2, ensure_ascii=False)}</div>
+                <div class='step-output-data'>{tool_output_json}</div>
             </div>
         </div>"""
-        for idx, step in enumerate(intermediate_steps, 1)
-    ])
+_STEP_DEFAULTS = {'tool_name': 'Unknown', 'tool_input': 'N/A', 'tool_output_json': '{}'}
+
+# Constant fragments of the plan lists, joined around the dynamic values
+_PLAN_ITEMS_OPEN = "<div class='plan-items'>"
+_PLAN_ITEM_OPEN = "<span class='plan-item'>"
+_PLAN_ITEM_STEP_OPEN = "<span class='plan-item'>Étape "
+_SPAN_CLOSE = "</span>"
+_DIV_CLOSE = "</div>"
+_PLAN_DONE_HTML = "<p style='color: #065f46; font-style: italic;'>✅ Aucune étape restante - Plan terminé</p>"
+
+
+def _render_tool_output(tool_output: Any) -> str:
+    """Pretty-print a tool output, keeping only its head and tail when it is very large."""
+    serialized = _dumps_pretty(tool_output)
+    if len(serialized) <= _MAX_INLINE_BYTES:
+        return _esc(serialized.decode('utf-8'))
+    half = _MAX_INLINE_BYTES // 2
+    # A slice may cut a multi-byte character at its edge; drop the fragment
+    head = serialized[:half].decode('utf-8', 'ignore')
+    tail = serialized[-half:].decode('utf-8', 'ignore')
+    return (f"{_esc(head)}\n"
+            f"<details><summary>… ({len(serialized) - 2 * half:,} octets tronqués, cliquer pour voir la fin)</summary>"
+            f"{_esc(tail)}</details>")
+
+
+_EXECUTOR_SUMMARY_TEMPLATE = """
+<hr>
+<h3>🔍 Analyse de l'Exécution</h3>
+<p>Le <strong>Tool Executor</strong> a démontré sa capacité à :</p>
+<ul>
+    <li>⚙️ <strong>Exécuter</strong> l'outil sélectionné avec succès ({first_tool_name})</li>
+    <li>📦 <strong>Capturer</strong> la sortie de l'outil dans l'état intermédiaire</li>
+    <li>🔄 <strong>Mettre à jour</strong> le plan en retirant l'étape exécutée</li>
+    <li>📊 <strong>Préparer</strong> le système pour la prochaine étape du processus</li>
+</ul>
+<p>L'exécuteur agit comme le travailleur du système, transformant les instructions du planificateur en actions concrètes et en gérant l'état de l'agent de manière structurée.</p>
+"""
+
+
+@_requires_display
+def display_executor_test(plan: List[str], remaining_plan: List[str], intermediate_steps: List[Dict[str, Any]]):
+    """Display executor test results in a formatted way.
+    
+    Args:
+        plan: Original plan before execution
+        remaining_plan: Plan after executing one step
+        intermediate_steps: Steps executed with their outputs (each dict has tool_name, tool_input, tool_output)
+    """
+    _ensure_styles_loaded()
+    
+    # Build initial plan items HTML
+    parts: List[str] = []
+    for i, step in enumerate(plan, 1):
+        parts.extend((_PLAN_ITEM_STEP_OPEN, str(i), ": ", _esc(step), _SPAN_CLOSE))
+    plan_items_html = ''.join(parts)
+    
+    # Build executed steps HTML
+    parts = []
+    for idx, step in enumerate(intermediate_steps, 1):
+        # Fields the step lacks come from the defaults
+        fields = {'idx': idx}
+        if 'tool_output' in step:
+            fields['tool_output_json'] = _Markup(_render_tool_output(step['tool_output']))
+        parts.append(_render(_STEP_TEMPLATE, ChainMap(fields, step, _STEP_DEFAULTS)))
+    executed_steps_html = ''.join(parts)
     
     # Build remaining plan HTML
     if remaining_plan:
-        remaining_plan_html = "<div class='plan-items'>" + ''.join(
-            [f"<span class='plan-item'>{step}</span>" for step in remaining_plan]
-        ) + "</div>"
+        parts = [_PLAN_ITEMS_OPEN]
+        for step in remaining_plan:
+            parts.extend((_PLAN_ITEM_OPEN, _esc(step), _SPAN_CLOSE))
+        parts.append(_DIV_CLOSE)
+        remaining_plan_html = ''.join(parts)
     else:
-        remaining_plan_html = "<p style='color: #065f46; font-style: italic;'>✅ Aucune étape restante - Plan terminé</p>"
+        remaining_plan_html = _PLAN_DONE_HTML
     
     steps_completed = len(intermediate_steps)
     steps_remaining = len(remaining_plan)
@@ -1134,20 +1561,7 @@ def display_executor_test(plan: List[str], remaining_plan: List[str], intermedia
         </div>
     </div>
 </div>
-"""))
-    
-    display(Markdown(f"""
----
-### 🔍 Analyse de l'Exécution
-
-Le **Tool Executor** a démontré sa capacité à :
-- ⚙️ **Exécuter** l'outil sélectionné avec succès ({first_tool_name})
-- 📦 **Capturer** la sortie de l'outil dans l'état intermédiaire
-- 🔄 **Mettre à jour** le plan en retirant l'étape exécutée
-- 📊 **Préparer** le système pour la prochaine étape du processus
-
-L'exécuteur agit comme le travailleur du système, transformant les instructions du planificateur en actions concrètes et en gérant l'état de l'agent de manière structurée.
-"""))
+""" + _render(_EXECUTOR_SUMMARY_TEMPLATE, {'first_tool_name': first_tool_name})))
 
 
 
@@ -1155,9 +1569,9 @@ L'exécuteur agit comme le travailleur du système, transformant les instruction
 # AUDITOR DISPLAYS
 # ============================================================================
 
-def display_auditor_styles():
-    """Display CSS styles for auditor test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_auditor_styles_html() -> str:
+    return """
 <style>
 .auditor-container { margin: 20px 0; }
 
@@ -1315,39 +1729,99 @@ def display_auditor_styles():
     color: #5b21b6;
 }
 </style>
-"""))
+"""
 
 
-def display_auditor_test(original_request: str, verification_result: Dict[str, Any]):
-    """Display auditor test results in a formatted way.
-    
-    Args:
-        original_request: The original user request
-        verification_result: Dict with keys: confidence_score, is_consistent, is_relevant, reasoning
-    """
-    display_auditor_styles()
-    
-    # Extract verification data
-    confidence_score = verification_result.get('confidence_score', 0)
-    is_consistent = verification_result.get('is_consistent', False)
-    is_relevant = verification_result.get('is_relevant', False)
-    reasoning = verification_result.get('reasoning', 'No reasoning provided')
-    
-    # Determine score presentation
-    if confidence_score >= 4:
-        score_class, score_emoji = 'score-high', '🟢'
-    elif confidence_score >= 3:
-        score_class, score_emoji = 'score-medium', '🟡'
-    else:
-        score_class, score_emoji = 'score-low', '🔴'
-    
-    # Determine status
-    status_text = "approuvée et peut continuer" if confidence_score >= 3 else "nécessite une replanification"
-    status_icon = "✅" if confidence_score >= 3 else "⚠️"
-    status_detail = ("Le système peut procéder à l'étape suivante du plan." if confidence_score >= 3 
-                     else "Le routeur renverra la requête au planificateur pour essayer une nouvelle approche.")
-    
-    display(HTML(f"""
+@_requires_display
+def display_auditor_styles():
+    """Display CSS styles for auditor test output (part of the shared core stylesheet)."""
+    _ensure_styles_loaded()
+
+
+# Score presentation by confidence score; anything below 3 is low
+_SCORE_STYLE = {
+    5: ('score-high', '🟢'),
+    4: ('score-high', '🟢'),
+    3: ('score-medium', '🟡'),
+}
+
+# Auditor panels, rendered once per possible value: confidence scores are
+# integers in 0..5, and the two audit flags have four combinations
+_SCORE_PANEL_TEMPLATE = """
+            <div class='score-display'>
+                <div class='score-circle {score_class}'>
+                    <div>{score_emoji}</div>
+                    <div>{confidence_score}/5</div>
+                    <div class='score-label'>Confiance</div>
+                </div>
+            </div>
+"""
+
+_METRICS_PANEL_TEMPLATE = """
+            <div class='audit-metrics'>
+                <div class='metric-card'>
+                    <div class='metric-icon'>{consistent_icon}</div>
+                    <div class='metric-label'>Cohérence interne</div>
+                    <div class='metric-value metric-{consistent_flag}'>
+                        {consistent_text}
+                    </div>
+                </div>
+                <div class='metric-card'>
+                    <div class='metric-icon'>{relevant_icon}</div>
+                    <div class='metric-label'>Pertinence</div>
+                    <div class='metric-value metric-{relevant_flag}'>
+                        {relevant_text}
+                    </div>
+                </div>
+            </div>
+"""
+
+_STATUS_PANEL_TEMPLATE = """
+        <div class='audit-summary'>
+            <strong>{status_icon} Décision de l'Auditor</strong><br>
+            <div style='margin-top: 10px;'>
+                La sortie de l'outil a été {status_text}.
+                {status_detail}
+            </div>
+        </div>
+"""
+
+
+def _render_score_panel(score: int) -> str:
+    score_class, score_emoji = _SCORE_STYLE.get(score, ('score-low', '🔴'))
+    return _SCORE_PANEL_TEMPLATE.format(score_class=score_class, score_emoji=score_emoji,
+                                        confidence_score=score).strip()
+
+
+def _render_status_panel(score: int) -> str:
+    approved = score >= 3
+    return _STATUS_PANEL_TEMPLATE.format(
+        status_icon="✅" if approved else "⚠️",
+        status_text="approuvée et peut continuer" if approved else "nécessite une replanification",
+        status_detail=("Le système peut procéder à l'étape suivante du plan." if approved
+                       else "Le routeur renverra la requête au planificateur pour essayer une nouvelle approche."),
+    ).strip()
+
+
+def _render_metrics_panel(is_consistent: bool, is_relevant: bool) -> str:
+    return _METRICS_PANEL_TEMPLATE.format(
+        consistent_icon='✅' if is_consistent else '❌',
+        consistent_flag='true' if is_consistent else 'false',
+        consistent_text='Cohérent' if is_consistent else 'Incohérent',
+        relevant_icon='🎯' if is_relevant else '❌',
+        relevant_flag='true' if is_relevant else 'false',
+        relevant_text='Pertinent' if is_relevant else 'Non pertinent',
+    ).strip()
+
+
+_SCORE_PANELS = tuple(_Markup(_render_score_panel(score)) for score in range(6))
+_STATUS_PANELS = tuple(_Markup(_render_status_panel(score)) for score in range(6))
+_METRICS_PANELS = {
+    (consistent, relevant): _Markup(_render_metrics_panel(consistent, relevant))
+    for consistent in (False, True) for relevant in (False, True)
+}
+
+_AUDITOR_TEMPLATE = """
 <div class='auditor-container'>
     <div class='auditor-header'>
         <h2 class='auditor-title'>🔍 Test du Auditor Node</h2>
@@ -1367,30 +1841,9 @@ def display_auditor_test(original_request: str, verification_result: Dict[str, A
                 <span>Résultat de la Vérification</span>
             </div>
             
-            <div class='score-display'>
-                <div class='score-circle {score_class}'>
-                    <div>{score_emoji}</div>
-                    <div>{confidence_score}/5</div>
-                    <div class='score-label'>Confiance</div>
-                </div>
-            </div>
+            {score_panel}
             
-            <div class='audit-metrics'>
-                <div class='metric-card'>
-                    <div class='metric-icon'>{'✅' if is_consistent else '❌'}</div>
-                    <div class='metric-label'>Cohérence interne</div>
-                    <div class='metric-value metric-{'true' if is_consistent else 'false'}'>
-                        {'Cohérent' if is_consistent else 'Incohérent'}
-                    </div>
-                </div>
-                <div class='metric-card'>
-                    <div class='metric-icon'>{'🎯' if is_relevant else '❌'}</div>
-                    <div class='metric-label'>Pertinence</div>
-                    <div class='metric-value metric-{'true' if is_relevant else 'false'}'>
-                        {'Pertinent' if is_relevant else 'Non pertinent'}
-                    </div>
-                </div>
-            </div>
+            {metrics_panel}
             
             <div style='margin-top: 20px;'>
                 <div class='audit-label'>💭 Raisonnement de l'auditeur :</div>
@@ -1400,29 +1853,52 @@ def display_auditor_test(original_request: str, verification_result: Dict[str, A
             </div>
         </div>
         
-        <div class='audit-summary'>
-            <strong>{status_icon} Décision de l'Auditor</strong><br>
-            <div style='margin-top: 10px;'>
-                La sortie de l'outil a été {status_text}.
-                {status_detail}
-            </div>
-        </div>
+        {status_panel}
     </div>
 </div>
-"""))
-    
-    display(Markdown(f"""
----
-### 🔍 Analyse de la Vérification
+"""
 
-Le **Auditor** a démontré sa capacité à :
-- 🎯 **Évaluer** la pertinence de la sortie par rapport à la requête originale
-- 🔍 **Vérifier** la cohérence interne des données retournées
-- 📊 **Attribuer** un score de confiance quantitatif ({confidence_score}/5)
-- 💭 **Justifier** sa décision avec un raisonnement clair
 
-Cette couche d'auto-correction cognitive permet au système de détecter les sorties de faible qualité et de déclencher une replanification si nécessaire, rendant l'agent plus robuste et fiable.
-"""))
+_AUDITOR_SUMMARY_TEMPLATE = """
+<hr>
+<h3>🔍 Analyse de la Vérification</h3>
+<p>Le <strong>Auditor</strong> a démontré sa capacité à :</p>
+<ul>
+    <li>🎯 <strong>Évaluer</strong> la pertinence de la sortie par rapport à la requête originale</li>
+    <li>🔍 <strong>Vérifier</strong> la cohérence interne des données retournées</li>
+    <li>📊 <strong>Attribuer</strong> un score de confiance quantitatif ({confidence_score}/5)</li>
+    <li>💭 <strong>Justifier</strong> sa décision avec un raisonnement clair</li>
+</ul>
+<p>Cette couche d'auto-correction cognitive permet au système de détecter les sorties de faible qualité et de déclencher une replanification si nécessaire, rendant l'agent plus robuste et fiable.</p>
+"""
+
+
+@_requires_display
+def display_auditor_test(original_request: str, verification_result: Dict[str, Any]):
+    """Display auditor test results in a formatted way.
+    
+    Args:
+        original_request: The original user request
+        verification_result: Dict with keys: confidence_score, is_consistent, is_relevant, reasoning
+    """
+    _ensure_styles_loaded()
+    
+    # Extract verification data
+    confidence_score = verification_result.get('confidence_score', 0)
+    is_consistent = verification_result.get('is_consistent', False)
+    is_relevant = verification_result.get('is_relevant', False)
+    reasoning = verification_result.get('reasoning', 'No reasoning provided')
+    
+    # Pick the precomputed panels (scores are clamped to 0..5)
+    score = max(0, min(5, int(confidence_score)))
+    
+    display(HTML(_render(_AUDITOR_TEMPLATE, {
+        'original_request': original_request,
+        'score_panel': _SCORE_PANELS[score],
+        'metrics_panel': _METRICS_PANELS[bool(is_consistent), bool(is_relevant)],
+        'reasoning': reasoning,
+        'status_panel': _STATUS_PANELS[score],
+    }) + _render(_AUDITOR_SUMMARY_TEMPLATE, {'confidence_score': score})))
 
 
 
@@ -1430,9 +1906,9 @@ Cette couche d'auto-correction cognitive permet au système de détecter les sor
 # ROUTER DISPLAYS
 # ============================================================================
 
-def display_router_styles():
-    """Display CSS styles for router test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_router_styles_html() -> str:
+    return """
 <style>
 .router-container { margin: 20px 0; }
 
@@ -1468,6 +1944,9 @@ def display_router_styles():
     margin: 20px 0;
     overflow: hidden;
     transition: transform 0.2s, box-shadow 0.2s;
+    /* Off-screen cards skip layout and paint */
+    content-visibility: auto;
+    contain-intrinsic-size: auto 300px;
 }
 
 .router-test-case:hover {
@@ -1612,41 +2091,34 @@ def display_router_styles():
     color: #831843;
 }
 </style>
-"""))
+"""
 
 
-def display_router_test(test_cases: List[Dict[str, Any]]):
-    """Display router test results in a formatted way.
-    
-    Args:
-        test_cases: List of test case dicts with keys: 
-            - name: str (test case name)
-            - icon: str (emoji icon)
-            - color_class: str (CSS class for color)
-            - state: Dict (state passed to router)
-            - result: str (router decision)
-            - explanation: str (explanation of the decision)
-    """
-    display_router_styles()
-    
-    # Build test cases HTML
-    test_cases_html = ''
-    for case in test_cases:
-        # Format state for display
-        state_items = []
-        for key, value in case['state'].items():
-            if value is not None:
-                if isinstance(value, list):
-                    state_items.append(f"<strong>{key}:</strong> {value}")
-                else:
-                    state_items.append(f"<strong>{key}:</strong> '{value}'")
-        state_display = '<br>'.join(state_items) if state_items else '<em>État vide</em>'
-        
-        test_cases_html += f"""
+@_requires_display
+def display_router_styles():
+    """Display CSS styles for router test output."""
+    _display_styles_once('router', _build_router_styles_html)
+
+
+_ROUTER_SUMMARY_HTML = """
+<hr>
+<h3>🔍 Analyse du Routeur</h3>
+<p>Le <strong>Router</strong> est le système nerveux de notre agent. Il a démontré sa capacité à :</p>
+<ul>
+    <li>🧠 <strong>Analyser</strong> l'état courant du système de manière hiérarchique</li>
+    <li>🔀 <strong>Décider</strong> du prochain nœud à exécuter selon une logique conditionnelle sophistiquée</li>
+    <li>🔄 <strong>Gérer</strong> les boucles de rétroaction pour l'auto-correction</li>
+    <li>🎯 <strong>Optimiser</strong> le flux d'exécution pour maximiser la qualité des résultats</li>
+</ul>
+<p>Cette logique de routage transforme notre graphe en un véritable moteur de raisonnement cognitif capable d'adaptation et d'auto-amélioration.</p>
+"""
+
+
+_ROUTER_CASE_TEMPLATE = """
         <div class='router-test-case'>
-            <div class='test-case-header {case['color_class']}'>
-                <span style='font-size: 1.3em;'>{case['icon']}</span>
-                <span>{case['name']}</span>
+            <div class='test-case-header {color_class}'>
+                <span style='font-size: 1.3em;'>{icon}</span>
+                <span>{name}</span>
             </div>
             <div class='test-case-content'>
                 <div class='test-scenario'>
@@ -1660,17 +2132,17 @@ def display_router_test(test_cases: List[Dict[str, Any]]):
                         <span>Décision du routeur :</span>
                     </div>
                     <div style='text-align: center; margin: 15px 0;'>
-                        <span class='decision-result'>{case['result']}</span>
+                        <span class='decision-result'>{result}</span>
                     </div>
                     <div class='decision-explanation'>
-                        {case['explanation']}
+                        {explanation}
                     </div>
                 </div>
             </div>
         </div>
         """
-    
-    display(HTML(f"""
+
+_ROUTER_TEMPLATE = """
 <div class='router-container'>
     <div class='router-header'>
         <h2 class='router-title'>🧭 Test du Router Node</h2>
@@ -1717,20 +2189,50 @@ def display_router_test(test_cases: List[Dict[str, Any]]):
         </div>
     </div>
 </div>
-"""))
-    
-    display(Markdown(f"""
----
-### 🔍 Analyse du Routeur
+""" + _ROUTER_SUMMARY_HTML
 
-Le **Router** est le système nerveux de notre agent. Il a démontré sa capacité à :
-- 🧠 **Analyser** l'état courant du système de manière hiérarchique
-- 🔀 **Décider** du prochain nœud à exécuter selon une logique conditionnelle sophistiquée
-- 🔄 **Gérer** les boucles de rétroaction pour l'auto-correction
-- 🎯 **Optimiser** le flux d'exécution pour maximiser la qualité des résultats
 
-Cette logique de routage transforme notre graphe en un véritable moteur de raisonnement cognitif capable d'adaptation et d'auto-amélioration.
-"""))
+def _format_state_item(key: str, value: Any) -> str:
+    """One escaped `key: value` line of a router test state; lists are shown unquoted."""
+    if isinstance(value, list):
+        return f"<strong>{_esc(key)}:</strong> {_safe(value)}"
+    return f"<strong>{_esc(key)}:</strong> '{_safe(value)}'"
+
+
+@_requires_display
+def display_router_test(test_cases: List[Dict[str, Any]]):
+    """Display router test results in a formatted way.
+    
+    Args:
+        test_cases: List of test case dicts with keys: 
+            - name: str (test case name)
+            - icon: str (emoji icon)
+            - color_class: str (CSS class for color)
+            - state: Dict (state passed to router)
+            - result: str (router decision)
+            - explanation: str (explanation of the decision)
+    """
+    display_router_styles()
+    
+    # Build test cases HTML
+    parts: List[str] = []
+    for case in test_cases:
+        state_display = '<br>'.join(
+            _format_state_item(key, value)
+            for key, value in case['state'].items() if value is not None
+        ) or '<em>État vide</em>'
+        
+        parts.append(_render(_ROUTER_CASE_TEMPLATE, {
+            'color_class': case['color_class'],
+            'icon': case['icon'],
+            'name': case['name'],
+            'state_display': _Markup(state_display),
+            'result': case['result'],
+            'explanation': _Markup(_safe(case['explanation'])),
+        }))
+    test_cases_html = ''.join(parts)
+    
+    display(HTML(_render(_ROUTER_TEMPLATE, {'test_cases_html': _Markup(test_cases_html)})))
 
 
 
@@ -1738,9 +2240,9 @@ Cette logique de routage transforme notre graphe en un véritable moteur de rais
 # SYNTHESIZER/STRATEGIST DISPLAYS
 # ============================================================================
 
-def display_synthesizer_styles():
-    """Display CSS styles for synthesizer test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_synthesizer_styles_html() -> str:
+    return """
 <style>
 .synthesizer-container { margin: 20px 0; }
 
@@ -1820,6 +2322,9 @@ def display_synthesizer_styles():
     border-radius: 8px;
     margin: 12px 0;
     overflow: hidden;
+    /* Off-screen cards skip layout and paint */
+    content-visibility: auto;
+    contain-intrinsic-size: auto 150px;
 }
 
 .tool-output-header {
@@ -1940,36 +2445,66 @@ def display_synthesizer_styles():
     margin-right: 8px;
 }
 </style>
-"""))
+"""
 
 
-def display_synthesizer_test(original_request: str, intermediate_steps: List[Dict[str, Any]], 
-                             final_response: str):
-    """Display synthesizer/strategist test results in a formatted way.
-    
-    Args:
-        original_request: The original user request
-        intermediate_steps: List of tool executions with their outputs
-        final_response: The synthesized final response with causal inference
-    """
-    display_synthesizer_styles()
-    
-    # Build tool outputs HTML
-    tools_html = ''
-    for idx, step in enumerate(intermediate_steps, 1):
-        tool_name = step.get('tool_name', 'Unknown')
-        tool_input = step.get('tool_input', 'N/A')
-        tool_output = step.get('tool_output', {})
-        
-        # Format output preview
-        if isinstance(tool_output, str):
-            output_preview = tool_output[:200] + ('...' if len(tool_output) > 200 else '')
-        elif isinstance(tool_output, list):
-            output_preview = f"{len(tool_output)} résultat(s) trouvé(s)"
-        else:
-            output_preview = json.dumps(tool_output, indent=2)[:200]
-        
-        tools_html += f"""
+@_requires_display
+def display_synthesizer_styles():
+    """Display CSS styles for synthesizer test output."""
+    _display_styles_once('synthesizer', _build_synthesizer_styles_html)
+
+
+_PREVIEW_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+
+def _json_preview(obj: Any, limit: int) -> str:
+    """First `limit` characters of the pretty JSON, encoding no more of `obj` than needed."""
+    buf = io.StringIO()
+    for chunk in _PREVIEW_ENCODER.iterencode(obj):
+        buf.write(chunk)
+        if buf.tell() >= limit:
+            break
+    return buf.getvalue()[:limit]
+
+
+_PREVIEW_CHARS = 200
+
+
+def _preview_text(text: str) -> str:
+    return text[:_PREVIEW_CHARS] + ('...' if len(text) > _PREVIEW_CHARS else '')
+
+
+def _preview_list(items: list) -> str:
+    return f"{len(items)} résultat(s) trouvé(s)"
+
+
+def _preview_json(obj: Any) -> str:
+    return _json_preview(obj, _PREVIEW_CHARS)
+
+
+# Tool output preview formatter, by exact type of the output
+_OUTPUT_PREVIEWS = {str: _preview_text, list: _preview_list}
+
+_FULL_OUTPUT_TEMPLATE = (
+    "<details><summary>Voir la sortie complète ({size})</summary>"
+    "<pre style='background: #f1f5f9; padding: 10px; border-radius: 4px; margin: 8px 0; overflow-x: auto; font-size: 0.9em;'>{full}</pre>"
+    "</details>"
+)
+
+
+def _render_full_output(tool_output: Any, preview: str) -> str:
+    """Collapsed block holding the output beyond its preview, capped at _MAX_INLINE_BYTES characters."""
+    if isinstance(tool_output, str):
+        full = tool_output[:_MAX_INLINE_BYTES]
+    else:
+        full = _json_preview(tool_output, _MAX_INLINE_BYTES)
+    if full == preview or full in ('', '[]', '{}'):
+        return ''
+    size = f"{len(full):,} caractères" + (", tronquée" if len(full) >= _MAX_INLINE_BYTES else '')
+    return _render(_FULL_OUTPUT_TEMPLATE, {'size': size, 'full': full})
+
+
+_TOOL_OUTPUT_CARD_TEMPLATE = """
         <div class='tool-output-card'>
             <div class='tool-output-header'>
                 <span>🔧</span>
@@ -1983,12 +2518,13 @@ def display_synthesizer_test(original_request: str, intermediate_steps: List[Dic
                 <div class='tool-info-line'>
                     <span class='tool-info-label'>Sortie:</span>
                     <pre style='background: #f1f5f9; padding: 10px; border-radius: 4px; margin: 8px 0; overflow-x: auto; font-size: 0.9em;'>{output_preview}</pre>
+                    {full_output}
                 </div>
             </div>
         </div>
         """
-    
-    display(HTML(f"""
+
+_SYNTHESIZER_TEMPLATE = """
 <div class='synthesizer-container'>
     <div class='synthesizer-header'>
         <h2 class='synthesizer-title'>🧠 Test du Strategist (Synthesizer) Node</h2>
@@ -2008,15 +2544,7 @@ def display_synthesizer_test(original_request: str, intermediate_steps: List[Dic
         <div class='context-section'>
             <div class='context-title'>
                 <span>📊</span>
-                <span>Contexte des agents spécialisés ({len(intermediate_steps)} outil(s) exécuté(s)) :</span>
-            </div>
-            {tools_html}
-        </div>
-        
-        <div class='context-section'>
-            <div class='context-title'>
-                <span>📊</span>
-                <span>Contexte des agents spécialisés ({len(intermediate_steps)} outil(s) exécuté(s)) :</span>
+                <span>Contexte des agents spécialisés ({tool_count} outil(s) exécuté(s)) :</span>
             </div>
             {tools_html}
         </div>
@@ -2034,32 +2562,86 @@ def display_synthesizer_test(original_request: str, intermediate_steps: List[Dic
         </div>
     </div>
 </div>
-"""))
-    
-    # Display the final response in a separate section with proper Markdown rendering
-    display(HTML("""
+"""
+
+_RESPONSE_BLOCK_TEMPLATE = """
 <div style='margin: 20px 0;'>
     <div style='background: linear-gradient(90deg, #f59e0b 0%, #d97706 100%); color: white; padding: 15px 20px; border-radius: 8px 8px 0 0; font-weight: bold; font-size: 1.15em; display: flex; align-items: center; gap: 10px; box-shadow: 0 2px 8px rgba(245, 158, 11, 0.3);'>
         <span>✨</span>
         <span>Réponse Finale Synthétisée</span>
     </div>
+    {response_html}
 </div>
-"""))
-    
-    display(Markdown(final_response))
-    
-    display(Markdown(f"""
+"""
+
+_SYNTHESIZER_ANALYSIS_TEMPLATE = """
+
 ---
 ### 🔍 Analyse de la Synthèse
 
 Le **Strategist** a démontré sa capacité à :
-- 📊 **Compiler** les résultats de {len(intermediate_steps)} outil(s) spécialisé(s) de manière cohérente
+- 📊 **Compiler** les résultats de {tool_count} outil(s) spécialisé(s) de manière cohérente
 - 🔗 **Connecter** les informations provenant de sources différentes (données quantitatives et qualitatives)
 - 💭 **Générer** des hypothèses causales et des insights au-delà de la simple compilation
 - 📝 **Articuler** une réponse claire, structurée et à haute valeur ajoutée
 
 Cette capacité d'**inférence causale** transforme notre agent d'un simple agrégateur de données en un véritable **moteur de raisonnement** capable de générer des perspectives analytiques comparables à celles d'un expert humain.
-"""))
+"""
+
+
+@_requires_display
+def display_synthesizer_test(original_request: str, intermediate_steps: List[Dict[str, Any]], 
+                             final_response: str):
+    """Display synthesizer/strategist test results in a formatted way.
+    
+    Args:
+        original_request: The original user request
+        intermediate_steps: List of tool executions with their outputs
+        final_response: The synthesized final response with causal inference
+    """
+    display_synthesizer_styles()
+    
+    # Build tool outputs HTML
+    parts: List[str] = []
+    for idx, step in enumerate(intermediate_steps, 1):
+        tool_name = step.get('tool_name', 'Unknown')
+        tool_input = step.get('tool_input', 'N/A')
+        tool_output = step.get('tool_output', {})
+        
+        output_preview = _OUTPUT_PREVIEWS.get(type(tool_output), _preview_json)(tool_output)
+        full_output = _render_full_output(tool_output, output_preview)
+        
+        parts.append(_render(_TOOL_OUTPUT_CARD_TEMPLATE, {
+            'idx': idx,
+            'tool_name': tool_name,
+            'tool_input': _Markup(_safe(tool_input)),
+            'output_preview': _Markup(_safe(output_preview)),
+            'full_output': _Markup(full_output),
+        }))
+    tools_html = ''.join(parts)
+    
+    card_html = _render(_SYNTHESIZER_TEMPLATE, {
+        'original_request': _Markup(_safe(original_request)),
+        'tool_count': len(intermediate_steps),
+        'tools_html': _Markup(tools_html),
+    })
+    
+    analysis_md = _SYNTHESIZER_ANALYSIS_TEMPLATE.format(tool_count=len(intermediate_steps))
+    response_html = _markdown_html(final_response)
+    if response_html is None:
+        # No kernel-side renderer: the frontend renders the Markdown after the card
+        display(HTML(card_html + _RESPONSE_BLOCK_TEMPLATE.format(response_html='')))
+        display(_markdown()(final_response + analysis_md))
+    else:
+        response_block = _RESPONSE_BLOCK_TEMPLATE.format(
+            response_html=f"<div class='response-content'>{response_html}</div>")
+        analysis_html = _markdown_html(analysis_md)
+        if analysis_html is None:
+            # Plain-text response rendered in the kernel, but the analysis needs Markdown
+            display(HTML(card_html + response_block))
+            display(_markdown()(analysis_md))
+        else:
+            display(HTML(card_html + response_block + analysis_html))
 
 
 
@@ -2067,9 +2649,9 @@ Cette capacité d'**inférence causale** transforme notre agent d'un simple agr
 # RED TEAMING DISPLAYS
 # ============================================================================
 
-def display_red_team_styles():
-    """Display CSS styles for red teaming output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_red_team_styles_html() -> str:
+    return """
 <style>
 .red-team-container { margin: 20px 0; }
 
@@ -2114,10 +2696,17 @@ def display_red_team_styles():
     border-radius: 10px;
     margin: 20px 0;
     overflow: hidden;
+    /* Off-screen cards skip layout, text shaping and paint */
+    content-visibility: auto;
+    contain-intrinsic-size: auto 400px;
+}
+
+/* Hover lift is opt-in (enable_red_team_hover()): batches of cards paint faster without it */
+.rt-interactive .attack-vector-card {
     transition: transform 0.2s, box-shadow 0.2s;
 }
 
-.attack-vector-card:hover {
+.rt-interactive .attack-vector-card:hover {
     transform: translateY(-2px);
     box-shadow: 0 6px 20px rgba(220, 38, 38, 0.15);
 }
@@ -2205,6 +2794,21 @@ def display_red_team_styles():
     overflow: hidden;
 }
 
+/* Verdict palette, read by the evaluation header, status badge and vector results */
+.verdict-robust {
+    --verdict-light: #d1fae5;
+    --verdict-mid: #a7f3d0;
+    --verdict-strong: #059669;
+    --verdict-dark: #065f46;
+}
+
+.verdict-vulnerable {
+    --verdict-light: #fee2e2;
+    --verdict-mid: #fecaca;
+    --verdict-strong: #dc2626;
+    --verdict-dark: #991b1b;
+}
+
 .eval-header {
     padding: 15px 20px;
     font-weight: bold;
@@ -2212,18 +2816,9 @@ def display_red_team_styles():
     display: flex;
     align-items: center;
     gap: 10px;
-}
-
-.eval-robust {
-    background: linear-gradient(90deg, #d1fae5 0%, #a7f3d0 100%);
-    border-bottom: 3px solid #059669;
-    color: #065f46;
-}
-
-.eval-vulnerable {
-    background: linear-gradient(90deg, #fee2e2 0%, #fecaca 100%);
-    border-bottom: 3px solid #dc2626;
-    color: #991b1b;
+    background: linear-gradient(90deg, var(--verdict-light) 0%, var(--verdict-mid) 100%);
+    border-bottom: 3px solid var(--verdict-strong);
+    color: var(--verdict-dark);
 }
 
 .eval-content { padding: 20px; }
@@ -2237,38 +2832,9 @@ def display_red_team_styles():
     color: white;
 }
 
-.badge-robust { background: #059669; }
-.badge-vulnerable { background: #dc2626; }
+.badge-status { background: var(--verdict-strong); }
 .badge-neutral { background: #6b7280; }
 
-.eval-metrics {
-    display: grid;
-    grid-template-columns: 1fr 1fr;
-    gap: 15px;
-    margin: 20px 0;
-}
-
-.eval-metric-card {
-    background: #f9fafb;
-    border: 1px solid #e5e7eb;
-    border-radius: 8px;
-    padding: 15px;
-}
-
-.metric-title {
-    font-size: 0.85em;
-    color: #6b7280;
-    margin-bottom: 8px;
-    text-transform: uppercase;
-    letter-spacing: 0.5px;
-}
-
-.metric-value {
-    font-size: 1.3em;
-    font-weight: bold;
-    color: #1e293b;
-}
-
 .summary-table-wrapper {
     background: white;
     border: 2px solid #e5e7eb;
@@ -2315,13 +2881,7 @@ def display_red_team_styles():
     margin: 20px 0;
 }
 
-.stat-card {
-    background: white;
-    border-radius: 8px;
-    padding: 15px;
-    text-align: center;
-    border: 2px solid #fecaca;
-}
+.red-team-summary .stat-card { border-color: #fecaca; }
 
 .stat-number {
     font-size: 2.5em;
@@ -2329,8 +2889,7 @@ def display_red_team_styles():
     margin: 10px 0;
 }
 
-.stat-label {
-    color: #6b7280;
+.red-team-summary .stat-label {
     font-size: 0.9em;
     text-transform: uppercase;
     letter-spacing: 0.5px;
@@ -2368,30 +2927,20 @@ def display_red_team_styles():
     padding: 4px 12px;
     border-radius: 12px;
     font-size: 0.9em;
+    background: var(--verdict-light);
+    color: var(--verdict-dark);
 }
+</style>
+"""
 
-.result-pass {
-    background: #d1fae5;
-    color: #065f46;
-}
 
-.result-fail {
-    background: #fee2e2;
-    color: #991b1b;
-}
-</style>
-"""))
+@_requires_display
+def display_red_team_styles():
+    """Display CSS styles for red teaming output."""
+    _display_styles_once('red_team', _build_red_team_styles_html)
 
 
-def display_red_team_header(attack_vector: str):
-    """Display header for red team prompt generation.
-    
-    Args:
-        attack_vector: The attack vector being tested
-    """
-    display_red_team_styles()
-    
-    display(HTML(f"""
+_RED_TEAM_HEADER_TEMPLATE = """
 <div class='red-team-container'>
     <div class='red-team-header'>
         <h2 class='red-team-title'>
@@ -2402,19 +2951,28 @@ def display_red_team_header(attack_vector: str):
         <p class='red-team-subtitle'>Test Red Team - Vecteur d'attaque: {attack_vector}</p>
     </div>
 </div>
-"""))
+"""
 
 
-def display_generated_prompts(attack_vector: str, prompts: List[Dict[str, str]]):
-    """Display generated adversarial prompts.
+@_requires_display
+def enable_red_team_hover():
+    """Turn on the hover lift of red team cards (needs a trusted notebook to run the script)."""
+    display(HTML("<script>document.body.classList.add('rt-interactive');</script>"))
+
+
+@_requires_display
+def display_red_team_header(attack_vector: str):
+    """Display header for red team prompt generation.
     
     Args:
-        attack_vector: The attack vector tested
-        prompts: List of prompt dicts with 'prompt' and 'reasoning' keys
+        attack_vector: The attack vector being tested
     """
-    prompts_html = ''
-    for idx, p in enumerate(prompts, 1):
-        prompts_html += f"""
+    display_red_team_styles()
+    
+    display(HTML(_render(_RED_TEAM_HEADER_TEMPLATE, {'attack_vector': attack_vector})))
+
+
+_PROMPT_CARD_TEMPLATE = """
         <div class='attack-vector-card'>
             <div class='attack-header'>
                 <span>⚠️</span>
@@ -2423,17 +2981,17 @@ def display_generated_prompts(attack_vector: str, prompts: List[Dict[str, str]])
             <div class='attack-content'>
                 <div class='prompt-box'>
                     <div class='prompt-label'>📝 Prompt:</div>
-                    <div class='prompt-text'>"{p['prompt']}"</div>
+                    <div class='prompt-text'>"{prompt}"</div>
                 </div>
                 <div class='reasoning-box'>
                     <strong style='color: #374151;'>💭 Raisonnement:</strong>
-                    <div class='reasoning-text'>{p['reasoning']}</div>
+                    <div class='reasoning-text'>{reasoning}</div>
                 </div>
             </div>
         </div>
         """
-    
-    display(HTML(f"""
+
+_GENERATED_PROMPTS_TEMPLATE = """
 <div class='red-team-content'>
     <h3 style='color: #991b1b; margin-bottom: 20px; display: flex; align-items: center; gap: 10px;'>
         <span>🎯</span>
@@ -2441,39 +2999,39 @@ def display_generated_prompts(attack_vector: str, prompts: List[Dict[str, str]])
     </h3>
     {prompts_html}
 </div>
-"""))
+"""
 
 
-def display_red_team_test_result(attack_vector: str, prompt: str, response: str, 
-                                 evaluation: Optional[Dict[str, Any]] = None):
-    """Display a single red team test result.
+@_requires_display
+def display_generated_prompts(attack_vector: str, prompts: List[Dict[str, str]]):
+    """Display generated adversarial prompts.
     
     Args:
         attack_vector: The attack vector tested
-        prompt: The adversarial prompt
-        response: Agent's response
-        evaluation: Optional evaluation dict with keys: is_vulnerable, vulnerability_type, reasoning
+        prompts: List of prompt dicts with 'prompt' and 'reasoning' keys
     """
-    eval_html = ''
-    if evaluation:
-        is_vulnerable = evaluation.get('is_vulnerable', False)
-        vuln_type = evaluation.get('vulnerability_type', 'N/A')
-        reasoning = evaluation.get('reasoning', 'No reasoning provided')
-        
-        eval_class = 'eval-vulnerable' if is_vulnerable else 'eval-robust'
-        eval_icon = '❌' if is_vulnerable else '✅'
-        eval_status = 'VULNÉRABLE' if is_vulnerable else 'ROBUSTE'
-        badge_class = 'badge-vulnerable' if is_vulnerable else 'badge-robust'
-        
-        eval_html = f"""
-        <div class='evaluation-result'>
-            <div class='eval-header {eval_class}'>
+    display_red_team_styles()
+    
+    prompts_html = ''.join(
+        _render(_PROMPT_CARD_TEMPLATE, {'idx': idx, 'prompt': p['prompt'], 'reasoning': p['reasoning']})
+        for idx, p in enumerate(prompts, 1)
+    )
+    
+    display(HTML(_render(_GENERATED_PROMPTS_TEMPLATE, {
+        'attack_vector': attack_vector,
+        'prompts_html': _Markup(prompts_html),
+    })))
+
+
+_RED_TEAM_EVAL_TEMPLATE = """
+        <div class='evaluation-result {verdict_class}'>
+            <div class='eval-header'>
                 <span>{eval_icon}</span>
                 <span>Évaluation: {eval_status}</span>
             </div>
             <div class='eval-content'>
                 <div style='margin-bottom: 15px;'>
-                    <span class='eval-badge {badge_class}'>{eval_status}</span>
+                    <span class='eval-badge badge-status'>{eval_status}</span>
                     <span class='eval-badge badge-neutral'>{vuln_type}</span>
                 </div>
                 <div class='reasoning-box'>
@@ -2483,8 +3041,8 @@ def display_red_team_test_result(attack_vector: str, prompt: str, response: str,
             </div>
         </div>
         """
-    
-    display(HTML(f"""
+
+_RED_TEAM_RESULT_TEMPLATE = """
 <div class='attack-vector-card'>
     <div class='attack-header'>
         <span>🎯</span>
@@ -2505,68 +3063,131 @@ def display_red_team_test_result(attack_vector: str, prompt: str, response: str,
         {eval_html}
     </div>
 </div>
-"""))
+"""
+
+# Evaluation card fields by verdict: (verdict_class, eval_icon, eval_status)
+_RED_TEAM_VERDICTS = {
+    True: ('verdict-vulnerable', '❌', 'VULNÉRABLE'),
+    False: ('verdict-robust', '✅', 'ROBUSTE'),
+}
 
 
-def display_red_team_summary(summary_df: pd.DataFrame, all_evaluations: List[Dict[str, Any]]):
-    """Display comprehensive red team evaluation summary.
+# Cards already shown in each live red team output, by display_id
+_LIVE_CARDS: Dict[str, List[str]] = {}
+
+
+# Output handle of the last card shown per attack vector, for overwrite=True
+_RESULT_HANDLES: Dict[str, Any] = {}
+
+# Both registries belong to one cell: a later cell starts its own outputs
+_OUTPUTS_CELL: Optional[int] = None
+
+
+def _current_cell() -> Optional[int]:
+    """Execution count of the running notebook cell (None outside IPython)."""
+    try:
+        from IPython import get_ipython
+        return getattr(get_ipython(), 'execution_count', None)
+    except Exception:
+        return None
+
+
+def _claim_live_outputs() -> None:
+    """Forget the live outputs of earlier cells, so this cell never updates them."""
+    global _OUTPUTS_CELL
+    cell = _current_cell()
+    if cell != _OUTPUTS_CELL:
+        _LIVE_CARDS.clear()
+        _RESULT_HANDLES.clear()
+        _OUTPUTS_CELL = cell
+
+
+def _show_live_card(display_id: str, card_html: str) -> None:
+    """Append a card to the live output `display_id`, creating the output on first use."""
+    cards = _LIVE_CARDS.get(display_id)
+    if cards is None:
+        _LIVE_CARDS[display_id] = [card_html]
+        display(HTML(card_html), display_id=display_id)
+    else:
+        cards.append(card_html)
+        update_display(HTML(''.join(cards)), display_id=display_id)
+
+
+@_requires_display
+def display_red_team_test_result(attack_vector: str, prompt: str, response: str, 
+                                 evaluation: Optional[Dict[str, Any]] = None,
+                                 display_id: Optional[str] = None, overwrite: bool = False):
+    """Display a single red team test result.
     
     Args:
-        summary_df: Pandas DataFrame with summary statistics (from pivot table)
-        all_evaluations: List of evaluation dicts with 'attack_vector' and 'is_vulnerable' keys
+        attack_vector: The attack vector tested
+        prompt: The adversarial prompt
+        response: Agent's response
+        evaluation: Optional evaluation dict with keys: is_vulnerable, vulnerability_type, reasoning
+        display_id: Optional id of a live output; results sharing an id are appended to
+            that single output instead of each creating a new one (use a fresh id per run)
+        overwrite: Replace the card previously shown for the same attack vector
+            in the current cell instead of adding a new one
     """
-    # Calculate overall statistics
-    total_tests = len(all_evaluations)
-    total_robust = sum(1 for e in all_evaluations if not e['is_vulnerable'])
-    total_vulnerable = total_tests - total_robust
-    success_rate = (total_robust / total_tests * 100) if total_tests > 0 else 0
+    display_red_team_styles()
     
-    # Build vector breakdown
-    vector_stats = {}
-    for eval_item in all_evaluations:
-        vector = eval_item['attack_vector']
-        if vector not in vector_stats:
-            vector_stats[vector] = {'robust': 0, 'vulnerable': 0}
-        
-        if eval_item['is_vulnerable']:
-            vector_stats[vector]['vulnerable'] += 1
+    eval_html = ''
+    if evaluation:
+        verdict_class, eval_icon, eval_status = _RED_TEAM_VERDICTS[
+            bool(evaluation.get('is_vulnerable', False))]
+        eval_html = _render(_RED_TEAM_EVAL_TEMPLATE, {
+            'verdict_class': verdict_class,
+            'eval_icon': eval_icon,
+            'eval_status': eval_status,
+            'vuln_type': evaluation.get('vulnerability_type', 'N/A'),
+            'reasoning': evaluation.get('reasoning', 'No reasoning provided'),
+        })
+    
+    card_html = _render(_RED_TEAM_RESULT_TEMPLATE, {
+        'attack_vector': attack_vector,
+        'prompt': prompt,
+        'response': response,
+        'eval_html': _Markup(eval_html),
+    })
+    if overwrite or display_id is not None:
+        _claim_live_outputs()
+    if overwrite:
+        handle = _RESULT_HANDLES.get(attack_vector)
+        if handle is None:
+            _RESULT_HANDLES[attack_vector] = display(HTML(card_html), display_id=True)
         else:
-            vector_stats[vector]['robust'] += 1
-    
-    vector_html = ''
-    for vector, stats in vector_stats.items():
-        total = stats['robust'] + stats['vulnerable']
-        rate = (stats['robust'] / total * 100) if total > 0 else 0
-        result_class = 'result-pass' if rate == 100 else 'result-fail'
-        
-        vector_html += f"""
+            handle.update(HTML(card_html))
+    elif display_id is None:
+        display(HTML(card_html))
+    else:
+        _show_live_card(display_id, card_html)
+
+
+# Overall status by success rate: (minimum rate, stat class, icon, label), best first
+_STATUS_BUCKETS = (
+    (100, 'stat-success', '🟢', 'EXCELLENT'),
+    (80, 'stat-success', '🟢', 'BON'),
+    (60, 'stat-warning', '🟡', 'MOYEN'),
+    (0, 'stat-danger', '🔴', 'FAIBLE'),
+)
+
+# Opening insight by success rate: (minimum rate, message), best first
+_ROBUSTNESS_INSIGHTS = (
+    (100, "✅ <strong>Excellente robustesse</strong> : L'agent a résisté à tous les vecteurs d'attaque testés."),
+    (80, "✅ <strong>Bonne robustesse globale</strong> : L'agent montre une bonne résistance aux attaques adversariales."),
+    (0, "⚠️ <strong>Améliorations nécessaires</strong> : L'agent présente des vulnérabilités qui doivent être corrigées."),
+)
+
+_VECTOR_ITEM_TEMPLATE = """
         <div class='vector-item'>
             <span class='vector-name'>{vector}</span>
-            <span class='vector-result {result_class}'>
-                {stats['robust']}/{total} Robuste ({rate:.0f}%)
+            <span class='vector-result {verdict_class}'>
+                {robust}/{total} Robuste ({rate:.0f}%)
             </span>
         </div>
         """
-    
-    # Determine overall status
-    if success_rate == 100:
-        status_color = 'stat-success'
-        status_icon = '🟢'
-        status_text = 'EXCELLENT'
-    elif success_rate >= 80:
-        status_color = 'stat-success'
-        status_icon = '🟢'
-        status_text = 'BON'
-    elif success_rate >= 60:
-        status_color = 'stat-warning'
-        status_icon = '🟡'
-        status_text = 'MOYEN'
-    else:
-        status_color = 'stat-danger'
-        status_icon = '🔴'
-        status_text = 'FAIBLE'
-    
-    display(HTML(f"""
+
+_RED_TEAM_SUMMARY_TEMPLATE = """
 <div class='red-team-summary'>
     <div class='summary-title'>
         <span>📊</span>
@@ -2601,40 +3222,19 @@ def display_red_team_summary(summary_df: pd.DataFrame, all_evaluations: List[Dic
         {vector_html}
     </div>
 </div>
-"""))
-    
-    # Display DataFrame table
-    display(HTML("""
+"""
+
+_SUMMARY_TABLE_TEMPLATE = """
 <div class='summary-table-wrapper'>
     <div class='summary-table-title'>
         <span>📈</span>
         <span>Tableau Récapitulatif Détaillé</span>
     </div>
+    {table_html}
 </div>
-"""))
-    
-    display(summary_df)
-    
-    # Display insights
-    insights = []
-    
-    if success_rate == 100:
-        insights.append("✅ <strong>Excellente robustesse</strong> : L'agent a résisté à tous les vecteurs d'attaque testés.")
-    elif success_rate >= 80:
-        insights.append("✅ <strong>Bonne robustesse globale</strong> : L'agent montre une bonne résistance aux attaques adversariales.")
-    else:
-        insights.append("⚠️ <strong>Améliorations nécessaires</strong> : L'agent présente des vulnérabilités qui doivent être corrigées.")
-    
-    for vector, stats in vector_stats.items():
-        if stats['vulnerable'] > 0:
-            insights.append(f"🔍 <strong>{vector}</strong> : {stats['vulnerable']} vulnérabilité(s) détectée(s).")
-    
-    if not any(stats['vulnerable'] > 0 for stats in vector_stats.values()):
-        insights.append("🛡️ <strong>Protection complète</strong> : Aucune vulnérabilité détectée sur tous les vecteurs d'attaque.")
-    
-    insights_html = '<br>'.join(f"<div style='margin: 8px 0;'>{insight}</div>" for insight in insights)
-    
-    display(HTML(f"""
+"""
+
+_INSIGHTS_TEMPLATE = """
 <div style='background: linear-gradient(90deg, #eff6ff 0%, #dbeafe 100%); border-left: 5px solid #3b82f6; padding: 20px 25px; margin: 25px 0; border-radius: 8px;'>
     <h4 style='color: #1e40af; margin: 0 0 15px 0; display: flex; align-items: center; gap: 8px;'>
         <span>💡</span>
@@ -2642,16 +3242,100 @@ def display_red_team_summary(summary_df: pd.DataFrame, all_evaluations: List[Dic
     </h4>
     {insights_html}
 </div>
-"""))
+"""
+
+
+@lru_cache(maxsize=32)
+def _build_red_team_summary_html(vector_counts: Tuple[Tuple[str, int, int], ...]) -> Tuple[str, str]:
+    """Summary card and insights box for (attack_vector, robust, vulnerable) counts.
+    
+    Cached on the counts, so re-running a summary over the same evaluations
+    reuses the rendered HTML.
+    """
+    total_robust = sum(robust for _, robust, _ in vector_counts)
+    total_vulnerable = sum(vulnerable for _, _, vulnerable in vector_counts)
+    total_tests = total_robust + total_vulnerable
+    success_rate = (total_robust / total_tests * 100) if total_tests > 0 else 0
+    
+    # Build vector breakdown
+    parts: List[str] = []
+    for vector, robust, vulnerable in vector_counts:
+        total = robust + vulnerable
+        rate = robust / total * 100
+        parts.append(_render(_VECTOR_ITEM_TEMPLATE, {
+            'vector': vector,
+            'verdict_class': 'verdict-robust' if rate == 100 else 'verdict-vulnerable',
+            'robust': robust,
+            'total': total,
+            'rate': rate,
+        }))
+    vector_html = ''.join(parts)
+    
+    # Determine overall status
+    status_color, status_icon, status_text = next(
+        status for threshold, *status in _STATUS_BUCKETS if success_rate >= threshold)
+    
+    summary_html = _render(_RED_TEAM_SUMMARY_TEMPLATE, {
+        'total_tests': total_tests,
+        'total_robust': total_robust,
+        'total_vulnerable': total_vulnerable,
+        'status_color': status_color,
+        'success_rate': success_rate,
+        'status_icon': status_icon,
+        'status_text': status_text,
+        'vector_html': _Markup(vector_html),
+    })
+    
+    # Build insights
+    insights = [next(message for threshold, message in _ROBUSTNESS_INSIGHTS if success_rate >= threshold)]
+    
+    for vector, _, vulnerable in vector_counts:
+        if vulnerable > 0:
+            insights.append(f"🔍 <strong>{_esc(vector)}</strong> : {vulnerable} vulnérabilité(s) détectée(s).")
+    
+    if not total_vulnerable:
+        insights.append("🛡️ <strong>Protection complète</strong> : Aucune vulnérabilité détectée sur tous les vecteurs d'attaque.")
+    
+    insights_html = '<br>'.join(f"<div style='margin: 8px 0;'>{insight}</div>" for insight in insights)
+    
+    return summary_html, _render(_INSIGHTS_TEMPLATE, {'insights_html': _Markup(insights_html)})
+
+
+@_requires_display
+def display_red_team_summary(summary_df: pd.DataFrame, all_evaluations: List[Dict[str, Any]]):
+    """Display comprehensive red team evaluation summary.
+    
+    Args:
+        summary_df: Pandas DataFrame with summary statistics (from pivot table)
+        all_evaluations: List of evaluation dicts with 'attack_vector' and 'is_vulnerable' keys
+    """
+    display_red_team_styles()
+    
+    # Count outcomes per (attack vector, vulnerable) in a single pass
+    counts = Counter((e['attack_vector'], bool(e['is_vulnerable'])) for e in all_evaluations)
+    
+    # Vectors in order of first appearance
+    vector_counts = tuple(
+        (vector, counts[(vector, False)], counts[(vector, True)])
+        for vector in dict.fromkeys(vector for vector, _ in counts)
+    )
+    summary_html, insights_html = _build_red_team_summary_html(vector_counts)
+    
+    # The pivot table is small: render it once, inside its wrapper card
+    table_html = _render(_SUMMARY_TABLE_TEMPLATE, {
+        'table_html': _Markup(summary_df.to_html(border=0, classes='summary-table')),
+    })
+    
+    display(HTML(summary_html + table_html + insights_html))
 
 
 # ============================================================================
 # RUN APP DISPLAYS
 # ============================================================================
 
-def display_run_app_styles():
-    """Display CSS styles for run app test output."""
-    display(HTML(_get_common_styles() + """
+@lru_cache(maxsize=1)
+def _build_run_app_styles_html() -> str:
+    return """
 <style>
 .run-app-container {
     margin: 30px 0;
@@ -2855,22 +3539,13 @@ def display_run_app_styles():
     margin: 20px 0;
 }
 
-.stat-card {
-    background: white;
-    border: 2px solid #e5e7eb;
-    border-radius: 8px;
-    padding: 15px;
-    text-align: center;
-}
-
 .stat-icon {
     font-size: 2em;
     margin-bottom: 8px;
 }
 
-.stat-label {
+.execution-stats .stat-label {
     font-size: 0.85em;
-    color: #6b7280;
     margin-bottom: 5px;
 }
 
@@ -2887,27 +3562,16 @@ def display_run_app_styles():
     border: none;
 }
 </style>
-"""))
+"""
 
 
-def display_run_app_result(test_label: str, query: str, final_state: Dict[str, Any], 
-                           test_type: str = "specific"):
-    """Display results from running the app in a formatted way.
-    
-    Args:
-        test_label: Label for the test (e.g., "TEST 1: AMBIGUOUS QUERY")
-        query: The user query
-        final_state: Final state from the app execution
-        test_type: "ambiguous" or "specific" (default: "specific")
-    """
-    display_run_app_styles()
-    
-    # Determine badge styling
-    badge_class = "badge-ambiguous" if test_type == "ambiguous" else "badge-specific"
-    badge_text = "Requête Ambiguë" if test_type == "ambiguous" else "Requête Spécifique"
-    
-    # Build header
-    display(HTML(f"""
+@_requires_display
+def display_run_app_styles():
+    """Display CSS styles for run app test output."""
+    _display_styles_once('run_app', _build_run_app_styles_html)
+
+
+_RUN_APP_HEADER_TEMPLATE = """
 <div class='run-app-container'>
     <div class='run-app-header'>
         <h2 class='run-app-title'>
@@ -2921,12 +3585,9 @@ def display_run_app_result(test_label: str, query: str, final_state: Dict[str, A
     </div>
     <div class='run-app-body'>
         <span class='test-type-badge {badge_class}'>{badge_text}</span>
-"""))
-    
-    # Check if clarification is needed
-    if final_state.get('clarification_question'):
-        clarification = final_state['clarification_question']
-        display(HTML(f"""
+"""
+
+_CLARIFICATION_TEMPLATE = """
         <div class='clarification-container'>
             <div class='clarification-header'>
                 <span class='clarification-icon'>❓</span>
@@ -2944,13 +3605,9 @@ def display_run_app_result(test_label: str, query: str, final_state: Dict[str, A
                 et garantissant que l'agent ne travaille que sur des requêtes bien définies.
             </div>
         </div>
-        """))
-    else:
-        # Display execution stats
-        num_steps = len(final_state.get('intermediate_steps', []))
-        num_verifications = len(final_state.get('verification_history', []))
-        
-        display(HTML(f"""
+        """
+
+_RUN_APP_STATS_TEMPLATE = """
         <div class='execution-stats'>
             <div class='stat-card'>
                 <div class='stat-icon'>⚙️</div>
@@ -2975,27 +3632,14 @@ def display_run_app_result(test_label: str, query: str, final_state: Dict[str, A
                 <h3 class='response-title'>Réponse Finale Synthétisée</h3>
             </div>
             <div class='response-content'>
-        """))
-        
-        # Render the final response as Markdown
-        final_response = final_state.get('final_response', '*Aucune réponse générée.*')
-        display(Markdown(final_response))
-        
-        display(HTML("""
+        """
+
+_RESPONSE_CLOSE_HTML = """
             </div>
         </div>
-        """))
-        
-        # Display summary
-        tools_used = []
-        for step in final_state.get('intermediate_steps', []):
-            tool_name = step.get('tool_name', 'Unknown')
-            if tool_name not in tools_used:
-                tools_used.append(tool_name)
-        
-        tools_list = ', '.join([f"<code>{tool}</code>" for tool in tools_used])
-        
-        display(HTML(f"""
+        """
+
+_RUN_SUMMARY_TEMPLATE = """
         <div class='run-summary'>
             <strong>🎯 Exécution Complète Réussie !</strong><br>
             <div style='margin-top: 12px;'>
@@ -3015,8 +3659,75 @@ def display_run_app_result(test_label: str, query: str, final_state: Dict[str, A
                 </div>
             </div>
         </div>
-        """))
+        """
+
+
+@_requires_display
+def display_run_app_result(test_label: str, query: str, final_state: Dict[str, Any], 
+                           test_type: str = "specific"):
+    """Display results from running the app in a formatted way.
+    
+    Args:
+        test_label: Label for the test (e.g., "TEST 1: AMBIGUOUS QUERY")
+        query: The user query
+        final_state: Final state from the app execution
+        test_type: "ambiguous" or "specific" (default: "specific")
+    """
+    display_run_app_styles()
+    
+    # Determine badge styling
+    badge_class = "badge-ambiguous" if test_type == "ambiguous" else "badge-specific"
+    badge_text = "Requête Ambiguë" if test_type == "ambiguous" else "Requête Spécifique"
+    
+    # Build header
+    parts = [_render(_RUN_APP_HEADER_TEMPLATE, {
+        'test_label': test_label,
+        'query': query,
+        'badge_class': badge_class,
+        'badge_text': badge_text,
+    })]
+    
+    # Check if clarification is needed
+    if final_state.get('clarification_question'):
+        clarification = final_state['clarification_question']
+        parts.append(_render(_CLARIFICATION_TEMPLATE, {'clarification': clarification}))
+    else:
+        # Display execution stats
+        num_steps = len(final_state.get('intermediate_steps', []))
+        # The batched auditor stores one entry per pass with a result per output;
+        # inline (phase 3) nodes store one dict per output
+        num_verifications = sum(
+            len(verification.results) if hasattr(verification, 'results') else 1
+            for verification in final_state.get('verification_history', [])
+        )
+        
+        parts.append(_render(_RUN_APP_STATS_TEMPLATE, {
+            'num_steps': num_steps,
+            'num_verifications': num_verifications,
+        }))
+        
+        # Render the final response as Markdown, in the kernel when python-markdown is available
+        final_response = final_state.get('final_response', '*Aucune réponse générée.*')
+        response_html = _markdown_html(final_response)
+        if response_html is None:
+            display(HTML(''.join(parts)))
+            display(_markdown()(final_response))
+            parts = []
+        else:
+            parts.append(response_html)
+        parts.append(_RESPONSE_CLOSE_HTML)
+        
+        # Display summary
+        tools_used = dict.fromkeys(
+            step.get('tool_name', 'Unknown') for step in final_state.get('intermediate_steps', [])
+        )
+        tools_list = ', '.join([f"<code>{_esc(tool)}</code>" for tool in tools_used])
+        
+        parts.append(_render(_RUN_SUMMARY_TEMPLATE, {
+            'num_steps': num_steps,
+            'tools_list': _Markup(tools_list),
+        }))
     
-    display(HTML("</div></div>"))
-    display(HTML("<hr class='separator'>"))
+    parts.append("</div></div><hr class='separator'>")
+    display(HTML(''.join(parts)))
 
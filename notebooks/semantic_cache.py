@@ -0,0 +1,164 @@
+"""
+Semantic Cache Module
+Embedding-keyed response cache shared by the planner and the librarian tool,
+plus an exact-key TTL cache for deterministic per-query work
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Quarters, fiscal years and other numbers: queries differing only in these embed almost
+# identically ("Q3 2024 revenue" vs "Q4 2023 revenue") but must not share a cache entry
+_KEY_TERMS_RE = re.compile(r"\b(?:Q[1-4]|FY\s?\d{2,4}|\d+(?:[.,]\d+)*)\b", re.I)
+
+
+class SemanticCache:
+    """
+    Cache responses by the meaning of their query rather than its exact text.
+
+    A lookup embeds the query and returns the value stored for the most similar
+    past query, provided their cosine similarity reaches the threshold, both
+    mention exactly the same periods and numbers, and the entry is younger than
+    the TTL. Least recently used entries are evicted once the cache holds
+    `max_entries` items.
+    """
+
+    def __init__(self, embedding_model: Any, threshold: float = 0.92,
+                 ttl: float = 3600, max_entries: int = 10000):
+        """
+        Args:
+            embedding_model: FastEmbed model (any object exposing .embed(texts))
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Maximum age of an entry, in seconds
+            max_entries: Capacity before LRU eviction
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # get() followed by put() on a miss embeds the same query only once
+        self._embed = lru_cache(maxsize=256)(
+            lambda text: self._normalize(next(iter(embedding_model.embed([text]))))
+        )
+        self._lock = threading.Lock()
+
+        # Slot-based storage: row i of _vectors belongs to _slot_keys[i]
+        self._vectors: Optional[np.ndarray] = None
+        self._timestamps = np.zeros(max_entries, dtype=np.float64)
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._term_ids = np.full(max_entries, -1, dtype=np.int64)  # id of each entry's key terms
+        self._term_id_of: Dict[frozenset, int] = {}
+        self._values: List[Any] = [None] * max_entries
+        self._slot_keys: List[Optional[str]] = [None] * max_entries
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self._slots: "OrderedDict[str, int]" = OrderedDict()  # key -> slot, in LRU order
+
+    @staticmethod
+    def _normalize(vector: Any) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    @staticmethod
+    def _key_terms(query: str) -> frozenset:
+        return frozenset(re.sub(r"\s", "", term).upper() for term in _KEY_TERMS_RE.findall(query))
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return the cached value for a semantically similar query, or None."""
+        vector = self._embed(query)
+        terms = self._key_terms(query)
+        with self._lock:
+            term_id = self._term_id_of.get(terms)
+            if self._slots and term_id is not None:
+                similarities = self._vectors @ vector
+                # Only fresh entries mentioning the same periods/numbers can match
+                eligible = (self._valid & (self._term_ids == term_id)
+                            & (time.time() - self._timestamps < self.ttl))
+                similarities[~eligible] = -1.0
+                slot = int(np.argmax(similarities))
+                if similarities[slot] >= self.threshold:
+                    self._slots.move_to_end(self._slot_keys[slot])
+                    self.hits += 1
+                    return self._values[slot]
+            self.misses += 1
+            return None
+
+    def put(self, query: str, value: Any) -> None:
+        """Store a value for the query, evicting the least recently used entry if full."""
+        vector = self._embed(query)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            if query in self._slots:
+                slot = self._slots.pop(query)
+            elif self._free_slots:
+                slot = self._free_slots.pop()
+            else:
+                _, slot = self._slots.popitem(last=False)
+
+            self._vectors[slot] = vector
+            self._timestamps[slot] = time.time()
+            self._valid[slot] = True
+            self._term_ids[slot] = self._term_id_of.setdefault(
+                self._key_terms(query), len(self._term_id_of))
+            self._values[slot] = value
+            self._slot_keys[slot] = query
+            self._slots[query] = slot
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._slots),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class TTLCache:
+    """
+    Exact-key LRU cache whose entries expire after `ttl` seconds.
+
+    Used for work that depends only on its exact input (query rewrites,
+    embeddings, rerank scores), where a semantic lookup would be overkill.
+    """
+
+    def __init__(self, max_items: int = 4096, ttl: float = 300):
+        """
+        Args:
+            max_items: Capacity before LRU eviction
+            ttl: Maximum age of an entry, in seconds
+        """
+        self.max_items = max_items
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Any, tuple]" = OrderedDict()  # key -> (timestamp, value)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the value stored for the key, or None if absent or expired."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            if time.time() - item[0] >= self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return item[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value for the key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._items[key] = (time.time(), value)
+            self._items.move_to_end(key)
+            if len(self._items) > self.max_items:
+                self._items.popitem(last=False)
@@ -3,63 +3,354 @@ Specialist Agent Tools for Financial Analysis
 This module contains all the specialist tools created in Phase 2.
 """
 
+import importlib.util
 import os
-import pandas as pd
+import platform
+import numpy as np
 import sqlite3
 import json
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import List, Dict, Any
 
+import torch
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langchain.tools import tool
 from sentence_transformers import CrossEncoder
-from fastembed import TextEmbedding
+from fastembed import SparseTextEmbedding, TextEmbedding
 import qdrant_client
+from qdrant_client.http import models as rest
 from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
 
+from config import Config
+from semantic_cache import SemanticCache, TTLCache
+
 # Global configurations
 QDRANT_PATH = "./qdrant_storage"
 COLLECTION_NAME = "financial_docs"
+DENSE_VECTOR_NAME = "dense"
+SPARSE_VECTOR_NAME = "sparse"
 DB_PATH = "financials.db"
 
+# Search the binary-quantized index, then rescore 3x oversampled candidates
+# with the original vectors (no-op on collections without quantization)
+SEARCH_PARAMS = rest.SearchParams(
+    quantization=rest.QuantizationSearchParams(ignore=False, rescore=True, oversampling=3.0)
+)
+
 # Initialize models and clients
 query_optimizer_llm = ChatOpenAI(model='gpt-4o-mini', api_key=os.getenv('OPENAI_API_KEY'), temperature=0.)
 
-cross_encoder_model = CrossEncoder('cross-encoder/ms-marco-MiniLM-L-6-v2')
-embedding_model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5")
+# ONNX Runtime execution providers, in order of preference (RAG_DEVICE=cuda to use the GPU)
+_ON_GPU = Config.RAG_DEVICE == "cuda"
+ONNX_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"] if _ON_GPU else ["CPUExecutionProvider"]
+
+# ONNX exports shipped with the model repo: the int8 build for this CPU architecture, or
+# the portable FP32 model on GPU (int8 kernels would fall back to the CPU) and on other CPUs.
+# PyTorch if Optimum/ONNX Runtime are not installed.
+if importlib.util.find_spec("optimum") and importlib.util.find_spec("onnxruntime"):
+    cross_encoder_model = CrossEncoder(
+        Config.CROSS_ENCODER_PATH,
+        device=Config.RAG_DEVICE,
+        backend="onnx",
+        model_kwargs={
+            "file_name": Config.CROSS_ENCODER_ONNX_FILE if _ON_GPU else Config.CROSS_ENCODER_ONNX_INT8_FILES.get(
+                platform.machine().lower(), Config.CROSS_ENCODER_ONNX_FILE),
+            "provider": ONNX_PROVIDERS[0]
+        }
+    )
+else:
+    print("⚠️ Optimum/ONNX Runtime not installed, running the cross-encoder on PyTorch")
+    cross_encoder_model = CrossEncoder(Config.CROSS_ENCODER_PATH, device=Config.RAG_DEVICE)
+embedding_model = TextEmbedding(model_name="BAAI/bge-small-en-v1.5", providers=ONNX_PROVIDERS)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent single-text embedding requests into FastEmbed batches.
+
+    Tools run in LangGraph worker threads; each caller blocks on a future while
+    a background thread embeds pending requests in one ONNX call. A request that
+    arrives alone is embedded at once; when others are already queued, the
+    thread keeps gathering for up to `window` seconds (or until `max_batch`).
+    """
+
+    def __init__(self, model: Any, max_batch: int = 32, window: float = 0.05):
+        self.model = model
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed(self, text: str):
+        """Return the embedding of one text, batched with concurrent callers."""
+        future = Future()
+        self._pending.put((text, future))
+        return future.result()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._pending.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch and (len(batch) > 1 or not self._pending.empty()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                vectors = list(self.model.embed([text for text, _ in batch], batch_size=self.max_batch))
+            except Exception as exc:
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+
+embedding_batcher = EmbeddingBatcher(
+    embedding_model,
+    max_batch=Config.EMBEDDING_BATCH_SIZE,
+    window=Config.EMBEDDING_BATCH_WINDOW
+)
+
+# Top-K chunk ids of past librarian queries, keyed on query meaning
+librarian_cache = SemanticCache(
+    embedding_model,
+    threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+    ttl=Config.SEMANTIC_CACHE_TTL,
+    max_entries=Config.SEMANTIC_CACHE_MAX_ENTRIES
+)
+
+# Runs the query optimizer LLM call while retrieval proceeds on the raw query
+_optimizer_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="query-optimizer")
+
+# Exact-match caches for the per-stage work of librarian queries
+_optimize_cache = TTLCache(max_items=Config.QUERY_CACHE_MAX_ITEMS, ttl=Config.QUERY_CACHE_TTL)
+_embedding_cache = TTLCache(max_items=Config.QUERY_CACHE_MAX_ITEMS, ttl=Config.QUERY_CACHE_TTL)
+_rerank_cache = TTLCache(max_items=Config.QUERY_CACHE_MAX_ITEMS, ttl=Config.QUERY_CACHE_TTL)
 
 _qdrant_client = None
 def get_qdrant_client():
-    """Get or create a singleton Qdrant client instance."""
+    """Get or create a singleton Qdrant client instance (server over gRPC if QDRANT_URL is set, else embedded)."""
     global _qdrant_client
     if _qdrant_client is None:
-        _qdrant_client = qdrant_client.QdrantClient(path=QDRANT_PATH)
+        if Config.QDRANT_URL:
+            _qdrant_client = qdrant_client.QdrantClient(url=Config.QDRANT_URL, prefer_grpc=True)
+        else:
+            _qdrant_client = qdrant_client.QdrantClient(path=QDRANT_PATH)
     return _qdrant_client
 
 client = get_qdrant_client()
 
+# Collections indexed with a sparse (SPLADE) vector get dense + sparse hybrid search
+# fused server-side; older dense-only collections (or none yet, before Phase 1) keep
+# the single vector search
+HYBRID_SEARCH = client.collection_exists(collection_name=COLLECTION_NAME) and SPARSE_VECTOR_NAME in (
+    client.get_collection(collection_name=COLLECTION_NAME).config.params.sparse_vectors or {}
+)
+sparse_embedding_model = SparseTextEmbedding(model_name=Config.SPARSE_EMBEDDING_MODEL) if HYBRID_SEARCH else None
+
 # Initialize SQL database
 db = SQLDatabase.from_uri(f"sqlite:///{DB_PATH}")
 
+# Persistent read-only connection for analyst_trend_tool, shared across worker threads
+# under a lock (read-only: the database file's journal mode is left untouched)
+_trend_conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True, check_same_thread=False)
+_trend_conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+_trend_lock = threading.Lock()
+
+# revenue_summary held in memory as columns, re-read only after another connection commits
+_TREND_METRIC = 'revenue_usd_billions'
+_trend_series: Dict[str, Any] = {'data_version': None, 'periods': None, 'values': None}
+
+
+def _load_trend_series() -> Dict[str, Any]:
+    """Return the cached (periods, values) columns of revenue_summary, refreshed if the DB changed."""
+    with _trend_lock:
+        data_version = _trend_conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != _trend_series['data_version']:
+            rows = _trend_conn.execute(
+                f"SELECT year, quarter, {_TREND_METRIC} FROM revenue_summary ORDER BY year, quarter"
+            ).fetchall()
+            _trend_series['periods'] = [f"{year}-{quarter}" for year, quarter, _ in rows]
+            _trend_series['values'] = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+            _trend_series['data_version'] = data_version
+        return _trend_series
+
 sql_agent_llm = ChatOpenAI(model='gpt-4o', api_key=os.getenv('OPENAI_API_KEY'), temperature=0.)
 
 sql_agent_executor = create_sql_agent(llm=sql_agent_llm, db=db, agent_type="openai-tools", verbose=True)
 
 
+# Fixed instructions first, user query last: the prefix is byte-identical on every
+# call, so it qualifies for provider-side prompt prefix caching
+OPTIMIZER_SYSTEM_MESSAGE = SystemMessage(content=(
+    "You are a query optimization expert. Rewrite the user query to be more specific "
+    "and effective for searching through corporate financial documents.\n"
+    "Return ONLY the optimized query text with no labels, explanations, or additional formatting."
+))
+
+
+# Queries naming at least two of these (period, fiscal year, metric, segment) are
+# specific enough already; rewriting them rarely changes what is retrieved
+_SPECIFIC_QUERY_TERMS = re.compile(
+    r"\b(Q[1-4]|FY\d{2,4}|20\d{2}|revenue|gross margin|net income|data center|gaming|automotive)\b",
+    re.I
+)
+optimizer_stats = Counter()  # 'skipped' / 'rewritten' calls of optimize_query
+_optimizer_stats_lock = threading.Lock()
+
+
+def get_optimizer_stats() -> Dict[str, Any]:
+    """Return how many optimize_query calls skipped the LLM, and the skip rate."""
+    with _optimizer_stats_lock:
+        skipped, rewritten = optimizer_stats['skipped'], optimizer_stats['rewritten']
+    calls = skipped + rewritten
+    return {
+        "skipped": skipped,
+        "rewritten": rewritten,
+        "skip_rate": skipped / calls if calls else 0.0
+    }
+
+
 # Helper function for query optimization
 def optimize_query(query: str) -> str:
-    """Uses an LLM to rewrite a query for better retrieval."""
-    prompt = f"""
-    You are a query optimization expert. Rewrite the following user query to be more specific and effective for searching through corporate financial documents.
-    
-    User Query: {query}
-    
-    Return ONLY the optimized query text with no labels, explanations, or additional formatting.
-    """
-    optimized_query = query_optimizer_llm.invoke(prompt).content
+    """Uses an LLM to rewrite a query for better retrieval, unless it is already specific."""
+    skip = len(_SPECIFIC_QUERY_TERMS.findall(query)) >= 2
+    with _optimizer_stats_lock:
+        optimizer_stats['skipped' if skip else 'rewritten'] += 1
+    if skip:
+        return query
+    messages = [OPTIMIZER_SYSTEM_MESSAGE, HumanMessage(content=f"User Query: {query}")]
+    optimized_query = query_optimizer_llm.invoke(messages).content
     return optimized_query
 
 
+def cached_optimize(query: str) -> str:
+    """optimize_query, memoized on the raw query for Config.QUERY_CACHE_TTL seconds."""
+    optimized_query = _optimize_cache.get(query)
+    if optimized_query is None:
+        optimized_query = optimize_query(query)
+        _optimize_cache.set(query, optimized_query)
+    return optimized_query
+
+
+def cached_embed(text: str):
+    """Embed a single text through the batcher, memoized on the text."""
+    vector = _embedding_cache.get(text)
+    if vector is None:
+        vector = embedding_batcher.embed(text)
+        _embedding_cache.set(text, vector)
+    return vector
+
+
+def score_pairs(query: str, contents: List[str]) -> np.ndarray:
+    """
+    Cross-encoder logits of (query, content) pairs at a fixed sequence length.
+
+    Unlike CrossEncoder.predict (padding to the longest pair), every call has the
+    same input shape, so the backend reuses its planned kernels.
+    """
+    features = cross_encoder_model.tokenizer(
+        [query] * len(contents), contents,
+        padding='max_length',
+        truncation='longest_first',
+        max_length=Config.CROSS_ENCODER_MAX_LENGTH,
+        return_tensors='pt'
+    ).to(cross_encoder_model.model.device)
+    with torch.inference_mode():
+        logits = cross_encoder_model.model(**features).logits
+    return logits.squeeze(-1).float().cpu().numpy()
+
+
+def cached_rerank_scores(optimized_query: str, search_results) -> List[float]:
+    """Cross-encoder scores of the results, memoized on the query and result ids."""
+    key = (optimized_query, tuple(result.id for result in search_results))
+    scores = _rerank_cache.get(key)
+    if scores is None:
+        scores = score_pairs(optimized_query, [result.payload['content'] for result in search_results])
+        _rerank_cache.set(key, scores)
+    return scores
+
+
+def _hydrate_results(hits) -> List[Dict[str, Any]]:
+    """Build librarian results from (point id, rerank score) pairs, fetching only their payloads."""
+    records = client.retrieve(
+        collection_name=COLLECTION_NAME,
+        ids=[point_id for point_id, _ in hits],
+        with_payload=['source', 'content', 'summary']
+    )
+    # Each payload holds exactly the requested fields; add the score in place rather than copying
+    payloads = {record.id: record.payload for record in records}
+    results = []
+    for point_id, score in hits:
+        payload = payloads.get(point_id)
+        if payload is not None:
+            payload['rerank_score'] = score
+            results.append(payload)
+    return results
+
+
+def _hybrid_search(text: str, dense_embedding) -> List[Any]:
+    """Dense and SPLADE candidates fused with RRF in a single Qdrant query, best first."""
+    sparse_embedding = next(iter(sparse_embedding_model.query_embed(text)))
+    return client.query_points(
+        collection_name=COLLECTION_NAME,
+        prefetch=[
+            rest.Prefetch(
+                query=dense_embedding,
+                using=DENSE_VECTOR_NAME,
+                limit=Config.INITIAL_RETRIEVAL_LIMIT,
+                params=SEARCH_PARAMS
+            ),
+            rest.Prefetch(
+                query=rest.SparseVector(
+                    indices=sparse_embedding.indices.tolist(),
+                    values=sparse_embedding.values.tolist()
+                ),
+                using=SPARSE_VECTOR_NAME,
+                limit=Config.INITIAL_RETRIEVAL_LIMIT
+            )
+        ],
+        query=rest.FusionQuery(fusion=rest.Fusion.RRF),
+        limit=Config.RERANK_CANDIDATES,
+        with_payload=['content'],
+        with_vectors=False
+    ).points
+
+
+def _warm_up_reranker():
+    """Score one steady-state-sized batch so backend kernel selection happens at import."""
+    try:
+        score_pairs("warm-up", ["warm-up"] * Config.RERANK_CANDIDATES)
+    except Exception as e:
+        print(f"⚠️ Could not pre-warm the cross-encoder: {e}")
+
+
+def _warm_up_retrieval():
+    """Run one throwaway search so index loading and model start-up happen at import, not on the first query."""
+    try:
+        text = "revenue"
+        embedding = cached_embed(text)
+        if HYBRID_SEARCH:
+            _hybrid_search(text, embedding)
+        else:
+            client.search(collection_name=COLLECTION_NAME, query_vector=embedding, limit=1, with_payload=False)
+    except Exception as e:
+        print(f"⚠️ Could not pre-warm the vector search: {e}")
+
+
 # Tool 1: Librarian RAG Tool
 @tool
 def librarian_rag_tool(query: str) -> List[Dict[str, Any]]:
@@ -69,38 +360,53 @@ def librarian_rag_tool(query: str) -> List[Dict[str, Any]]:
     """
     print(f"\n-- Librarian Tool Called with query: '{query}' --")
     
-    # 1. Optimize Query
-    optimized_query = optimize_query(query)
-    print(f"  - Optimized query: '{optimized_query}'")
+    # 0. Semantic cache: reuse the top chunks of a similar recent query
+    cached_hits = librarian_cache.get(query)
+    if cached_hits is not None:
+        print("  - Semantic cache hit, skipping optimization, search and re-ranking")
+        return _hydrate_results(cached_hits)
+    
+    # 1. Optimize Query (in the background when retrieval runs on the raw query)
+    if Config.SPECULATE_RETRIEVAL:
+        optimized_future = _optimizer_pool.submit(cached_optimize, query)
+        search_text = query
+    else:
+        optimized_future = None
+        search_text = optimized_query = cached_optimize(query)
     
     # 2. Vector Search
-    query_embedding = list(embedding_model.embed([optimized_query]))[0]
-    search_results = client.search(
-        collection_name=COLLECTION_NAME,
-        query_vector=query_embedding,
-        limit=20,
-        with_payload=True
-    )
+    query_embedding = cached_embed(search_text)
+    if HYBRID_SEARCH:
+        search_results = _hybrid_search(search_text, query_embedding)
+    else:
+        search_results = client.search(
+            collection_name=COLLECTION_NAME,
+            query_vector=query_embedding,
+            limit=Config.INITIAL_RETRIEVAL_LIMIT,
+            search_params=SEARCH_PARAMS,
+            with_payload=['content'],  # rerank input only; the top-K payloads are fetched afterwards
+            with_vectors=False
+        )
     print(f"  - Retrieved {len(search_results)} candidate chunks")
     
-    # 3. Re-rank
-    rerank_pairs = [[optimized_query, result.payload['content']] for result in search_results]
-    scores = cross_encoder_model.predict(rerank_pairs)
-    for i, score in enumerate(scores):
-        search_results[i].score = score
-    reranked_results = sorted(search_results, key=lambda x: x.score, reverse=True)
-    print("  - Re-ranked results")
+    if optimized_future is not None:
+        optimized_query = optimized_future.result()
+    print(f"  - Optimized query: '{optimized_query}'")
+    
+    # 3. Re-rank only the best vector hits (Qdrant returns them by descending score)
+    candidates = search_results[:Config.RERANK_CANDIDATES]
+    scores = np.asarray(cached_rerank_scores(optimized_query, candidates), dtype=np.float64)
+    print(f"  - Re-ranked top {len(candidates)} candidates")
+    
+    # 4. Return Top Results (partial selection of the best scores, then order just those)
+    top_k = Config.TOP_K_RESULTS
+    top_idx = np.argpartition(-scores, top_k)[:top_k] if len(scores) > top_k else np.arange(len(scores))
+    top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+    top_hits = tuple((candidates[i].id, float(scores[i])) for i in top_idx)
+    final_results = _hydrate_results(top_hits)
     
-    # 4. Return Top Results
-    top_k = 5
-    final_results = []
-    for result in reranked_results[:top_k]:
-        final_results.append({
-            'source': result.payload['source'],
-            'content': result.payload['content'],
-            'summary': result.payload['summary'],
-            'rerank_score': float(result.score)
-        })
+    # Cache ids and scores only; payloads are re-read from Qdrant on a hit
+    librarian_cache.put(query, top_hits)
     
     print(f"  - Returning top {top_k} chunks")
     return final_results
@@ -129,23 +435,16 @@ def analyst_trend_tool(query: str) -> str:
     """
     print(f"\n-- Analyst Trend Tool Called with query: '{query}' --")
     
-    conn = sqlite3.connect(DB_PATH)
-    df_trends = pd.read_sql_query("SELECT * FROM revenue_summary ORDER BY year, quarter", conn)
-    conn.close()
-
-    df_trends['period'] = df_trends['year'].astype(str) + '-' + df_trends['quarter']
-    df_trends.set_index('period', inplace=True)
+    metric = _TREND_METRIC
+    series = _load_trend_series()
+    periods, revenue = series['periods'], series['values']
     
-    metric = 'revenue_usd_billions'
-    df_trends['QoQ_Growth'] = df_trends[metric].pct_change()
-    df_trends['YoY_Growth'] = df_trends[metric].pct_change(4)
+    # Growth of the latest quarter over the previous one and the same quarter a year earlier
+    latest_qoq = revenue[-1] / revenue[-2] - 1 if len(revenue) >= 2 else float('nan')
+    latest_yoy = revenue[-1] / revenue[-5] - 1 if len(revenue) >= 5 else float('nan')
     
-    latest_period = df_trends.index[-1]
-    start_period = df_trends.index[0]
-    latest_val = df_trends.loc[latest_period, metric]
-    start_val = df_trends.loc[start_period, metric]
-    latest_qoq = df_trends.loc[latest_period, 'QoQ_Growth']
-    latest_yoy = df_trends.loc[latest_period, 'YoY_Growth']
+    start_period, latest_period = periods[0], periods[-1]
+    start_val, latest_val = revenue[0], revenue[-1]
     
     summary = f"""
     Analysis of {metric} from {start_period} to {latest_period}:
@@ -157,6 +456,9 @@ def analyst_trend_tool(query: str) -> str:
     return summary
 
 
+_warm_up_retrieval()
+_warm_up_reranker()
+
 # Create tool list and map
 tools = [librarian_rag_tool, analyst_sql_tool, analyst_trend_tool]
 tool_map = {tool.name: tool for tool in tools}